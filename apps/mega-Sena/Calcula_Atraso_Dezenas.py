@@ -1,11 +1,12 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from statistics import multimode, median
 
-import matplotlib.pyplot as plt
+# Só o essencial para a tela de upload; pandas, gráficos e motores são
+# importados depois que o arquivo chega
+from jogos import JOGOS, detectar_cols_bolas, erro_cols_bolas
 
 def barra_termometro(min_val, max_val, atual):
+    import matplotlib.pyplot as plt
+
     # Garantir que os valores fiquem dentro de 0–100
     min_val = max(0, min(100, min_val))
     max_val = max(0, min(100, max_val))
@@ -99,11 +100,15 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# Jogo escolhido antes do título, que depende dele
+st.sidebar.header("🎲 Loteria")
+jogo = JOGOS[st.sidebar.selectbox("Jogo analisado", list(JOGOS))]
+
 # ------------------------------------------------------------
 # Título customizado
 # ------------------------------------------------------------
 st.markdown(
-    """
+    f"""
     <h1 style="
         font-family: 'Montserrat', sans-serif;
         font-weight: 800;
@@ -121,7 +126,7 @@ st.markdown(
         margin-top: 0.25rem;
         margin-bottom: 1.5rem;
     ">
-        Análise estatística dos atrasos por dezena da Mega-Sena, com foco nas dezenas mais atrasadas,
+        Análise estatística dos atrasos por dezena da {jogo.nome}, com foco nas dezenas mais atrasadas,
         períodos em que lideraram como Top1 e termômetro visual em escala de 0 a 100 concursos.
     </p>
     """,
@@ -132,13 +137,29 @@ st.markdown(
 # Upload da base
 # ------------------------------------------------------------
 uploaded_file = st.file_uploader(
-    "📂 Envie o arquivo CSV com os resultados da Mega-Sena",
+    f"📂 Envie o arquivo CSV com os resultados da {jogo.nome}",
     type=["csv"]
 )
 
 if uploaded_file is None:
     st.stop()
 
+import pandas as pd
+import altair as alt
+
+from arquivos_prontos import carregar_base_binaria, carregar_relatorio
+from estabilidade_ranking import estabilidade_atraso
+from relatorio_lote import ROTULOS_BLOCOS, bloco_do_relatorio
+from motor_atrasos import (
+    posicoes_concursos,
+    matriz_atrasos_compacta,
+    historico_calor,
+    atrasos_bloco,
+    periodos_lideranca,
+    fatiar_periodos,
+    tabela_atrasos,
+)
+
 
 @st.cache_data
 def load_data(f):
@@ -156,12 +177,22 @@ def load_data(f):
 
 
 df = load_data(uploaded_file)
+binaria = carregar_base_binaria(uploaded_file.getvalue(), jogo)
+relatorio = carregar_relatorio(uploaded_file.getvalue(), jogo)
 
 cols_esperadas = {"Concurso", "Data"}
-cols_bolas = [c for c in df.columns if c.lower().startswith("bola")]
+cols_bolas = detectar_cols_bolas(df, jogo)
 
-if not cols_esperadas.issubset(df.columns) or len(cols_bolas) == 0:
-    st.error("❌ A base precisa ter as colunas `Concurso`, `Data` e colunas de bolas (`Bola1`, `Bola2`, ...).")
+if not cols_esperadas.issubset(df.columns):
+    st.error(
+        f"❌ A base precisa ter as colunas `Concurso`, `Data` e as colunas de bolas da {jogo.nome} "
+        f"(`{jogo.cols_bolas[0]}` a `{jogo.cols_bolas[-1]}`)."
+    )
+    st.stop()
+
+erro_bolas = erro_cols_bolas(df, jogo)
+if erro_bolas:
+    st.error(f"❌ {erro_bolas}")
     st.stop()
 
 # Tipos
@@ -182,13 +213,27 @@ st.sidebar.header("🎯 Bloco de Análise (por Concurso)")
 min_conc = int(df["Concurso"].min())
 max_conc = int(df["Concurso"].max())
 
-ini, fim = st.sidebar.slider(
-    "Intervalo de concursos",
-    min_value=min_conc,
-    max_value=max_conc,
-    value=(min_conc, max_conc),
-    step=1
-)
+# Com o relatório pré-calculado, os blocos padrão saem direto das tabelas gravadas
+blocos_prontos = relatorio["blocos"] if relatorio is not None else {}
+bloco_padrao = None
+if blocos_prontos:
+    bloco_padrao = st.sidebar.selectbox(
+        "Bloco padrão",
+        [None] + list(blocos_prontos),
+        format_func=lambda nome: "Intervalo livre" if nome is None else ROTULOS_BLOCOS.get(nome, nome)
+    )
+
+if bloco_padrao is not None:
+    ini, fim = blocos_prontos[bloco_padrao]["ini"], blocos_prontos[bloco_padrao]["fim"]
+    st.sidebar.caption(f"Concursos {ini} a {fim} (relatório pré-calculado)")
+else:
+    ini, fim = st.sidebar.slider(
+        "Intervalo de concursos",
+        min_value=min_conc,
+        max_value=max_conc,
+        value=(min_conc, max_conc),
+        step=1
+    )
 
 df_filtrado = df[(df["Concurso"] >= ini) & (df["Concurso"] <= fim)]
 
@@ -202,128 +247,49 @@ if df_filtrado.empty:
     st.warning("⚠️ Nenhum sorteio encontrado nesse bloco.")
     st.stop()
 
-df_filtrado = df_filtrado.sort_values("Concurso")
-
 # ------------------------------------------------------------
 # Cálculo dos atrasos + períodos Top1
 # ------------------------------------------------------------
-todas_dezenas = list(range(1, 61))
-
-# Atraso dinâmico
-atraso = {d: 0 for d in todas_dezenas}
-# Se a dezena está liderando neste momento
-in_lead = {d: False for d in todas_dezenas}
-# Quantos períodos completos de liderança
-streaks_top1 = {d: 0 for d in todas_dezenas}
-# Atrasos máximos por período de liderança
-atrasos_max_por_periodo = {d: [] for d in todas_dezenas}
-# Atraso máximo do período em andamento
-current_period_max = {d: 0 for d in todas_dezenas}
-
-prev_conc = None
-
-for _, row in df_filtrado.iterrows():
-    conc = int(row["Concurso"])
-
-    # Em caso de gaps de concurso, consideramos múltiplos sorteios
-    if prev_conc is None:
-        delta = 1
-    else:
-        delta = conc - prev_conc
-        if delta < 1:
-            delta = 1
-
-    # Incrementa atraso de todas as dezenas
-    for d in todas_dezenas:
-        atraso[d] += delta
-
-    # Zera atraso das dezenas sorteadas neste concurso
-    for col in cols_bolas:
-        dez = pd.to_numeric(row[col], errors="coerce")
-        if pd.notna(dez):
-            dez_int = int(dez)
-            if dez_int in atraso:
-                atraso[dez_int] = 0
-
-    # Determina o maior atraso > 0
-    max_atraso = max(atraso.values())
-    if max_atraso <= 0:
-        # Ninguém atrasado neste ponto
-        for d in todas_dezenas:
-            in_lead[d] = False
-        prev_conc = conc
-        continue
-
-    leaders = [d for d, a in atraso.items() if a == max_atraso and a > 0]
-
-    # Atualiza períodos de liderança
-    for d in todas_dezenas:
-        if d in leaders:
-            if not in_lead[d]:
-                # Começou um novo período de liderança
-                streaks_top1[d] += 1
-                current_period_max[d] = atraso[d]
-                in_lead[d] = True
-            else:
-                # Continua no período, atualiza máximo daquele período
-                current_period_max[d] = max(current_period_max[d], atraso[d])
-        else:
-            # Se estava em liderança e saiu, encerra o período
-            if in_lead[d]:
-                if current_period_max[d] > 0:
-                    atrasos_max_por_periodo[d].append(current_period_max[d])
-                current_period_max[d] = 0
-            in_lead[d] = False
-
-    prev_conc = conc
-
-# Encerra períodos ainda abertos no final do bloco
-for d in todas_dezenas:
-    if in_lead[d] and current_period_max[d] > 0:
-        atrasos_max_por_periodo[d].append(current_period_max[d])
-        current_period_max[d] = 0
+@st.cache_data
+def preparar_atrasos(df_ord, cols_bolas, jogo):
+    # Matriz de atrasos da base inteira (uint16) + períodos de liderança, calculados uma vez por arquivo
+    concursos = df_ord["Concurso"].to_numpy()
+    posicoes = posicoes_concursos(concursos)
+    atrasos = matriz_atrasos_compacta(df_ord, cols_bolas, jogo, posicoes)
+    return concursos, posicoes, atrasos, periodos_lideranca(atrasos, concursos)
 
-# ------------------------------------------------------------
-# Monta DataFrame final com Moda/Mediana + min/max
-# ------------------------------------------------------------
-linhas = []
-for d in todas_dezenas:
-    if atraso[d] > 0:  # desconsidera atraso = 0
-        lista = atrasos_max_por_periodo[d]
-
-        if len(lista) == 0:
-            atraso_tipico = None
-            min_top1 = None
-            max_top1 = None
-        else:
-            min_top1 = min(lista)
-            max_top1 = max(lista)
-
-            modos = multimode(lista)
-            freq_modo = lista.count(modos[0])
-
-            if freq_modo > 1:
-                # Existe moda verdadeira → pega a menor moda
-                atraso_tipico = min(modos)
-            else:
-                # Não há moda (todos diferentes) → usa mediana
-                atraso_tipico = median(lista)
-
-        linhas.append(
-            {
-                "Dezena": d,
-                "Atraso_Atual": atraso[d],
-                "Qtde_Vezes_Top1": streaks_top1[d],
-                "Atraso_Top1_Tipico": atraso_tipico,  # moda ou mediana
-                "Atraso_Top1_Min": min_top1,
-                "Atraso_Top1_Max": max_top1,
-            }
-        )
 
-df_res = pd.DataFrame(linhas).sort_values("Atraso_Atual", ascending=False)
+@st.cache_data
+def preparar_periodos(hash_csv, jogo, _binaria):
+    # Com a base binária a matriz já vem gravada: só os períodos são calculados
+    return periodos_lideranca(_binaria["atrasos"], _binaria["concursos"])
+
+
+if binaria is not None:
+    concursos, posicoes, atrasos_base = binaria["concursos"], binaria["posicoes"], binaria["atrasos"]
+    periodos_base = preparar_periodos(binaria["hash"], jogo, binaria)
+else:
+    df_ord = df.sort_values("Concurso", kind="stable").reset_index(drop=True)
+    concursos, posicoes, atrasos_base, periodos_base = preparar_atrasos(df_ord, cols_bolas, jogo)
+
+# O bloco é só um recorte da matriz, com os atrasos reiniciados no concurso inicial
+idx_ini = int(concursos.searchsorted(ini, side="left"))
+idx_fim = int(concursos.searchsorted(fim, side="right"))
+
+atrasos = atrasos_bloco(atrasos_base, posicoes, idx_ini, idx_fim)
+
+
+bloco_pronto = bloco_do_relatorio(relatorio, ini, fim)
+if bloco_pronto is not None:
+    df_res = bloco_pronto["atrasos"]
+else:
+    periodos = periodos_lideranca(atrasos, concursos[idx_ini:idx_fim])
+    df_res = tabela_atrasos(atrasos, periodos)
 
 st.subheader("📌 Atrasos por dezena (SEM atraso = 0)")
 st.dataframe(df_res.reset_index(drop=True), use_container_width=True)
+if bloco_pronto is not None:
+    st.caption("⚡ Tabela carregada do relatório pré-calculado deste arquivo.")
 
 # ------------------------------------------------------------
 # Gráfico Top 10 por atraso atual
@@ -352,6 +318,60 @@ chart_top10 = (
 
 #st.altair_chart(chart_top10, use_container_width=True)
 
+# ------------------------------------------------------------
+# Linha do tempo dos líderes (Top1) ao longo da base
+# ------------------------------------------------------------
+st.subheader("🕒 Líderes de atraso ao longo do tempo")
+
+periodos_tela = fatiar_periodos(periodos_base, ini, fim, atrasos_base, concursos)
+
+chart_lideres = (
+    alt.Chart(periodos_tela)
+    .transform_calculate(Fim_Barra="datum.Fim + 1")
+    .mark_bar()
+    .encode(
+        x=alt.X("Inicio:Q", title="Concurso", scale=alt.Scale(domain=[ini, fim + 1])),
+        x2="Fim_Barra:Q",
+        y=alt.Y("Dezena:O", title="Dezena"),
+        color=alt.Color("Atraso_Pico:Q", title="Atraso no pico", scale=alt.Scale(scheme="goldorange")),
+        tooltip=["Dezena", "Inicio", "Fim", "Atraso_Pico"],
+    )
+    .properties(height=500)
+)
+
+st.altair_chart(chart_lideres, use_container_width=True)
+st.caption(
+    "Cada barra é um período em que a dezena teve o maior atraso (Top1), "
+    "com atrasos contados desde o início da base e recortados no bloco selecionado."
+)
+
+# ------------------------------------------------------------
+# Estabilidade do Top 10 de atrasos no bloco
+# ------------------------------------------------------------
+if st.sidebar.checkbox("📊 Analisar estabilidade do Top 10", value=False):
+    resultado = estabilidade_atraso(atrasos, concursos[idx_ini:idx_fim])
+
+    st.subheader("📊 Estabilidade do Top 10 de atrasos")
+
+    if resultado is None:
+        st.info("O bloco precisa ter pelo menos 2 sorteios.")
+    else:
+        df_corr = resultado["correlacoes"]
+
+        ce1, ce2, ce3 = st.columns(3)
+        ce1.metric("Spearman médio (sorteios vizinhos)", f"{df_corr['Spearman'].mean():.3f}")
+        ce2.metric("Kendall médio", f"{df_corr['Kendall'].mean():.3f}")
+        ce3.metric("Renovação média do Top 10", f"{df_corr['Renovacao_Top'].mean():.1%}")
+
+        st.dataframe(
+            resultado["atrasadas"]
+            .sort_values("Posicoes_no_Top", ascending=False)
+            .style.format({"Fracao_no_Top": "{:.1%}", "Permanencia_Media": "{:.1f}"}, na_rep="—"),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption("Posicoes_no_Top = sorteios em que a dezena esteve entre as 10 mais atrasadas.")
+
 # ------------------------------------------------------------
 # Termômetro com tooltip + animação suave (Plotly)
 # ------------------------------------------------------------
@@ -467,3 +487,36 @@ else:
         - A escala é padronizada entre **0 e 100** concursos para facilitar comparação.
         """
     )
+
+# ------------------------------------------------------------
+# Histórico de calor: atraso de todas as dezenas em todos os sorteios
+# ------------------------------------------------------------
+if st.sidebar.checkbox("🌡️ Mostrar histórico de calor dos atrasos", value=False):
+    st.subheader("🌡️ Histórico de calor dos atrasos")
+
+    # Recorte direto da matriz da base inteira (atraso real, sem reiniciar no bloco)
+    calor, inicio_faixas = historico_calor(atrasos_base[idx_ini:idx_fim], concursos[idx_ini:idx_fim])
+
+    fig_calor = go.Figure(go.Heatmap(
+        z=calor.T,
+        x=inicio_faixas,
+        y=list(range(1, jogo.universo + 1)),
+        colorscale="YlOrRd",
+        colorbar=dict(title="Atraso"),
+        hovertemplate="Concurso %{x}<br>Dezena %{y}<br>Atraso máx.: %{z}<extra></extra>",
+    ))
+    fig_calor.update_layout(
+        height=max(400, 9 * jogo.universo),
+        margin=dict(l=30, r=30, t=20, b=40),
+        xaxis=dict(title="Concurso"),
+        yaxis=dict(title="Dezena", autorange="reversed", dtick=5),
+    )
+    st.plotly_chart(fig_calor, use_container_width=True)
+
+    if len(calor) < idx_fim - idx_ini:
+        st.caption(
+            f"Cada coluna agrupa {-(-(idx_fim - idx_ini) // len(calor))} sorteios e mostra o maior atraso de cada dezena no grupo. "
+            "Atrasos contados desde o início da base."
+        )
+    else:
+        st.caption("Uma coluna por sorteio. Atrasos contados desde o início da base.")
@@ -1,6 +1,8 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+
+# Só o essencial para a tela de upload; pandas, gráficos e motores são
+# importados depois que o arquivo chega
+from jogos import JOGOS, detectar_cols_bolas, erro_cols_bolas
 
 
 # ------------------------------------------------------------
@@ -39,11 +41,15 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# Jogo escolhido antes do título, que depende dele
+st.sidebar.header("🎲 Loteria")
+jogo = JOGOS[st.sidebar.selectbox("Jogo analisado", list(JOGOS))]
+
 # ------------------------------------------------------------
 # Título customizado
 # ------------------------------------------------------------
 st.markdown(
-    """
+    f"""
     <h1 style="
         font-family: 'Montserrat', sans-serif;
         font-weight: 800;
@@ -61,7 +67,7 @@ st.markdown(
         margin-top: 0.15rem;
         margin-bottom: 1.5rem;
     ">
-        Este aplicativo calcula a frequência de cada dezena da Mega-Sena,
+        Este aplicativo calcula a frequência de cada dezena da {jogo.nome},
     considerando **apenas o bloco de sorteios que você escolher**
     </p>
     """,
@@ -74,7 +80,7 @@ st.markdown(
 # Upload da base
 # ==============================
 uploaded_file = st.file_uploader(
-    "📂 Envie o arquivo CSV com os resultados da Mega-Sena",
+    f"📂 Envie o arquivo CSV com os resultados da {jogo.nome}",
     type=["csv"]
 )
 
@@ -82,6 +88,17 @@ if uploaded_file is None:
     st.info("⏳ Aguardando o upload do arquivo CSV...")
     st.stop()
 
+import pandas as pd
+import altair as alt
+
+from motor_frequencia import contagens_acumuladas, frequencia_bloco
+from arquivos_prontos import carregar_base_binaria, carregar_relatorio
+from comparacao import comparar_blocos
+from dados import estruturas_base
+from estabilidade_ranking import estabilidade_frequencia
+from estatistica import tabela_significancia, qui_quadrado_uniformidade, varredura_janelas
+from relatorio_lote import ROTULOS_BLOCOS, bloco_do_relatorio
+
 # Tentativa de leitura do CSV
 @st.cache_data
 def load_data(file):
@@ -100,17 +117,25 @@ def load_data(file):
 
 
 df = load_data(uploaded_file)
+binaria = carregar_base_binaria(uploaded_file.getvalue(), jogo)
+relatorio = carregar_relatorio(uploaded_file.getvalue(), jogo)
 
 # Validação básica
 cols_esperadas = {"Concurso", "Data"}
-cols_bolas = [c for c in df.columns if c.lower().startswith("bola")]
+cols_bolas = detectar_cols_bolas(df, jogo)
 
-if not cols_esperadas.issubset(df.columns) or len(cols_bolas) == 0:
+if not cols_esperadas.issubset(df.columns):
     st.error(
-        "❌ A base precisa ter, no mínimo, as colunas `Concurso`, `Data` e as colunas de bolas (`Bola1`, `Bola2`, ...)."
+        f"❌ A base precisa ter, no mínimo, as colunas `Concurso`, `Data` e as colunas de bolas da {jogo.nome} "
+        f"(`{jogo.cols_bolas[0]}` a `{jogo.cols_bolas[-1]}`)."
     )
     st.stop()
 
+erro_bolas = erro_cols_bolas(df, jogo)
+if erro_bolas:
+    st.error(f"❌ {erro_bolas}")
+    st.stop()
+
 # Garantir tipos adequados
 df["Concurso"] = pd.to_numeric(df["Concurso"], errors="coerce")
 df = df.dropna(subset=["Concurso"])
@@ -131,13 +156,27 @@ st.sidebar.header("🎯 Bloco de Análise (por Concurso)")
 min_conc = int(df["Concurso"].min())
 max_conc = int(df["Concurso"].max())
 
-ini, fim = st.sidebar.slider(
-    "Intervalo de concursos",
-    min_value=min_conc,
-    max_value=max_conc,
-    value=(min_conc, max_conc),
-    step=1
-)
+# Com o relatório pré-calculado, os blocos padrão saem direto das tabelas gravadas
+blocos_prontos = relatorio["blocos"] if relatorio is not None else {}
+bloco_padrao = None
+if blocos_prontos:
+    bloco_padrao = st.sidebar.selectbox(
+        "Bloco padrão",
+        [None] + list(blocos_prontos),
+        format_func=lambda nome: "Intervalo livre" if nome is None else ROTULOS_BLOCOS.get(nome, nome)
+    )
+
+if bloco_padrao is not None:
+    ini, fim = blocos_prontos[bloco_padrao]["ini"], blocos_prontos[bloco_padrao]["fim"]
+    st.sidebar.caption(f"Concursos {ini} a {fim} (relatório pré-calculado)")
+else:
+    ini, fim = st.sidebar.slider(
+        "Intervalo de concursos",
+        min_value=min_conc,
+        max_value=max_conc,
+        value=(min_conc, max_conc),
+        step=1
+    )
 
 df_filtrado = df[(df["Concurso"] >= ini) & (df["Concurso"] <= fim)]
 
@@ -151,30 +190,60 @@ if df_filtrado.empty:
     st.warning("⚠️ Nenhum sorteio encontrado nesse bloco.")
     st.stop()
 
-df_filtrado = df_filtrado.sort_values("Concurso")
-
 # ==============================
 # Cálculo da frequência das dezenas
 # ==============================
-# Empilhar todas as bolas do bloco selecionado
-valores = df_filtrado[cols_bolas].values.ravel()
+@st.cache_data
+def preparar_contagens(df_ord, cols_bolas, jogo):
+    # Contagens acumuladas da base inteira: qualquer bloco sai de uma subtração
+    return df_ord["Concurso"].to_numpy(), contagens_acumuladas(df_ord, cols_bolas, jogo)
 
-# Converte para inteiros válidos (ignorando NaN)
-series_dezenas = pd.to_numeric(pd.Series(valores), errors="coerce").dropna().astype(int)
 
-# Considera dezenas de 1 a 60
-todas_dezenas = range(1, 61)
-freq = series_dezenas.value_counts().reindex(todas_dezenas, fill_value=0)
+df_ord = df.sort_values("Concurso", kind="stable").reset_index(drop=True)
+if binaria is not None:
+    concursos, acumuladas = binaria["concursos"], binaria["acumuladas"]
+else:
+    concursos, acumuladas = preparar_contagens(df_ord, cols_bolas, jogo)
 
-df_freq = pd.DataFrame(
-    {
-        "Dezena": list(freq.index),
-        "Frequência": freq.values
-    }
-)
+idx_ini = int(concursos.searchsorted(ini, side="left"))
+idx_fim = int(concursos.searchsorted(fim, side="right"))
+qtd_sorteios = idx_fim - idx_ini
+
+
+bloco_pronto = bloco_do_relatorio(relatorio, ini, fim)
+if bloco_pronto is not None:
+    df_freq = bloco_pronto["frequencia"]
+else:
+    # Considera dezenas de 1 ao universo do jogo (NaN e valores fora da faixa são ignorados)
+    df_freq = frequencia_bloco(acumuladas, idx_ini, idx_fim)
+    df_freq = tabela_significancia(df_freq, qtd_sorteios, jogo)
 
 st.subheader("📈 Frequência das dezenas no bloco selecionado")
-st.dataframe(df_freq.style.format({"Frequência": "{:.0f}"}), use_container_width=True)
+st.dataframe(
+    df_freq.style.format({"Frequência": "{:.0f}", "Esperado": "{:.1f}", "Z": "{:+.2f}", "P_Valor": "{:.3f}"}),
+    use_container_width=True
+)
+st.caption(
+    f"Esperado = sorteios × {jogo.bolas_por_sorteio}/{jogo.universo}. "
+    "Z mede o desvio em relação ao esperado; P_Valor é bilateral (normal)."
+)
+if bloco_pronto is not None:
+    st.caption("⚡ Tabela carregada do relatório pré-calculado deste arquivo.")
+
+# ==============================
+# Teste de uniformidade (qui-quadrado)
+# ==============================
+qui2, gl, p_qui2 = qui_quadrado_uniformidade(df_freq["Frequência"].to_numpy(), qtd_sorteios, jogo)
+
+cq1, cq2, cq3 = st.columns(3)
+cq1.metric("Qui-quadrado", f"{qui2:.1f}")
+cq2.metric("Graus de liberdade", f"{gl}")
+cq3.metric("P-valor (uniformidade)", f"{p_qui2:.3f}")
+
+if p_qui2 < 0.05:
+    st.warning("⚠️ As frequências deste bloco se afastam da distribuição uniforme (p < 0,05).")
+else:
+    st.info("As diferenças de frequência deste bloco são compatíveis com sorteios uniformes (ruído).")
 
 # ==============================
 # Top 10 Máximos e Mínimos
@@ -227,5 +296,165 @@ with col2:
     )
     st.altair_chart(chart_min, use_container_width=True)
 
+# ==============================
+# Comparação entre dois blocos
+# ==============================
+st.sidebar.header("⚖️ Comparar Blocos")
+comparar = st.sidebar.checkbox("Comparar com outro bloco", value=False)
+
+if comparar:
+    ini_b, fim_b = st.sidebar.slider(
+        "Bloco B (concursos)",
+        min_value=min_conc,
+        max_value=max_conc,
+        value=(max(min_conc, max_conc - 199), max_conc),
+        step=1
+    )
+
+    @st.cache_data
+    def preparar_comparacao(df_ord, cols_bolas, jogo):
+        # Contagens, atrasos e ciclos da base inteira: cada bloco vira um recorte
+        return estruturas_base(df_ord, cols_bolas, jogo)
+
+    if binaria is not None:
+        estruturas = binaria
+    else:
+        estruturas = preparar_comparacao(df_ord, cols_bolas, jogo)
+    df_comp, df_resumo = comparar_blocos(estruturas, (ini, fim), (ini_b, fim_b))
+
+    st.subheader(f"⚖️ Bloco A ({ini}–{fim}) × Bloco B ({ini_b}–{fim_b})")
+    st.dataframe(
+        df_resumo.style.format({"Bloco_A": "{:.2f}", "Bloco_B": "{:.2f}", "Diferença": "{:+.2f}"}, na_rep="—"),
+        hide_index=True,
+        use_container_width=True
+    )
+
+    chart_delta = (
+        alt.Chart(df_comp)
+        .mark_bar()
+        .encode(
+            x=alt.X("Dezena:O", title="Dezena"),
+            y=alt.Y("Delta_Taxa100:Q", title="Δ frequência por 100 sorteios (B − A)"),
+            color=alt.condition("datum.Delta_Taxa100 > 0", alt.value("#FFD700"), alt.value("#00264d")),
+            tooltip=["Dezena", "Freq_A", "Freq_B", "Delta_Taxa100", "Rank_A", "Rank_B", "Delta_Rank"]
+        )
+        .properties(height=300)
+    )
+    st.altair_chart(chart_delta, use_container_width=True)
+
+    st.dataframe(
+        df_comp.sort_values("Delta_Rank", ascending=False).style.format(
+            {
+                "Taxa100_A": "{:.1f}", "Taxa100_B": "{:.1f}", "Delta_Taxa100": "{:+.1f}",
+                "Z_A": "{:+.2f}", "Z_B": "{:+.2f}",
+                "Top1_Tipico_A": "{:.1f}", "Top1_Tipico_B": "{:.1f}", "Delta_Top1_Tipico": "{:+.1f}",
+            },
+            na_rep="—"
+        ),
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("Delta_Rank positivo = a dezena subiu no ranking de frequência do bloco A para o B.")
+
+# ==============================
+# Varredura de janelas deslizantes
+# ==============================
+st.sidebar.header("🔎 Varredura de Janelas")
+varrer = st.sidebar.checkbox("Calcular para todas as janelas", value=False)
+
+if varrer:
+    janela = st.sidebar.number_input(
+        "Tamanho da janela (sorteios)",
+        min_value=10,
+        max_value=max(10, len(concursos)),
+        value=min(100, max(10, len(concursos))),
+        step=10
+    )
+
+    df_janelas = varredura_janelas(acumuladas, concursos, int(janela), jogo)
+
+    st.subheader(f"🔎 Uniformidade em janelas de {int(janela)} sorteios")
+
+    if df_janelas.empty:
+        st.info("A base tem menos sorteios do que o tamanho da janela.")
+    else:
+        linha_p = (
+            alt.Chart(df_janelas)
+            .mark_line()
+            .encode(
+                x=alt.X("Fim:Q", title="Concurso final da janela"),
+                y=alt.Y("P_Valor:Q", title="P-valor (qui-quadrado)", scale=alt.Scale(type="log")),
+                tooltip=["Inicio", "Fim", "Qui2", "P_Valor", "Dezena_Z_Max", "Z_Max"]
+            )
+        )
+        limite = alt.Chart(pd.DataFrame({"P_Valor": [0.05]})).mark_rule(color="#ff4b4b", strokeDash=[4, 4]).encode(y="P_Valor:Q")
+
+        st.altair_chart((linha_p + limite).properties(height=350), use_container_width=True)
+        st.caption(
+            f"{(df_janelas['P_Valor'] < 0.05).mean():.1%} das janelas ficam abaixo de p = 0,05 "
+            "(cerca de 5% é o esperado só por acaso; janelas vizinhas se sobrepõem)."
+        )
+
+# ==============================
+# Estabilidade do ranking (Top 10 ao longo do tempo)
+# ==============================
+st.sidebar.header("📊 Estabilidade do Ranking")
+estabilidade = st.sidebar.checkbox("Analisar estabilidade do Top 10", value=False)
+
+if estabilidade:
+    janela_rank = st.sidebar.number_input(
+        "Janela do ranking (sorteios)",
+        min_value=10,
+        max_value=max(10, len(concursos) - 1),
+        value=min(100, max(10, len(concursos) - 1)),
+        step=10
+    )
+
+    resultado = estabilidade_frequencia(acumuladas, concursos, int(janela_rank))
+
+    st.subheader(f"📊 Estabilidade do ranking em janelas de {int(janela_rank)} sorteios")
+
+    if resultado is None:
+        st.info("A base precisa ter mais sorteios do que o tamanho da janela.")
+    else:
+        df_corr = resultado["correlacoes"]
+        df_corr = df_corr[(df_corr["Fim"] >= ini) & (df_corr["Fim"] <= fim)]
+
+        ce1, ce2, ce3 = st.columns(3)
+        ce1.metric("Spearman médio (janelas vizinhas)", f"{df_corr['Spearman'].mean():.3f}")
+        ce2.metric("Kendall médio", f"{df_corr['Kendall'].mean():.3f}")
+        ce3.metric("Renovação média do Top 10", f"{df_corr['Renovacao_Quentes'].mean():.1%}")
+
+        chart_corr = (
+            alt.Chart(df_corr.melt(id_vars="Fim", value_vars=["Spearman", "Kendall"], var_name="Medida", value_name="Correlação"))
+            .mark_line()
+            .encode(
+                x=alt.X("Fim:Q", title="Concurso final da janela"),
+                y=alt.Y("Correlação:Q", scale=alt.Scale(zero=False)),
+                color="Medida:N",
+                tooltip=["Fim", "Medida", "Correlação"]
+            )
+            .properties(height=300)
+        )
+        st.altair_chart(chart_corr, use_container_width=True)
+
+        formato_persistencia = {"Fracao_no_Top": "{:.1%}", "Permanencia_Media": "{:.1f}"}
+        cp1, cp2 = st.columns(2)
+        with cp1:
+            st.write("**Permanência no Top 10 mais sorteadas** (base inteira)")
+            st.dataframe(
+                resultado["quentes"].sort_values("Posicoes_no_Top", ascending=False).style.format(formato_persistencia, na_rep="—"),
+                hide_index=True,
+                use_container_width=True
+            )
+        with cp2:
+            st.write("**Permanência no Top 10 menos sorteadas** (base inteira)")
+            st.dataframe(
+                resultado["frias"].sort_values("Posicoes_no_Top", ascending=False).style.format(formato_persistencia, na_rep="—"),
+                hide_index=True,
+                use_container_width=True
+            )
+        st.caption("Permanência em janelas consecutivas: cada janela anda 1 sorteio.")
+
 st.markdown("---")
-st.caption("App gerado automaticamente para análise de frequência de dezenas por bloco de sorteios da Mega-Sena.")
+st.caption(f"App gerado automaticamente para análise de frequência de dezenas por bloco de sorteios da {jogo.nome}.")
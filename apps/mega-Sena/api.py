@@ -0,0 +1,423 @@
+"""
+API JSON local sobre os mesmos cálculos dos apps (sem Streamlit).
+
+Rotas (GET):
+    /atraso?ini=&fim=       tabela de atrasos do bloco (igual ao app de atrasos)
+    /frequencia?ini=&fim=   frequência + esperado, Z e P_Valor do bloco
+    /ciclo?asof=            histórico de ciclos e ciclo aberto até o concurso `asof`
+    /comparar?ini_a=&fim_a=&ini_b=&fim_b=
+                            diferenças de frequência, ranking, atraso e ciclos entre dois blocos
+    /metricas               requisições, acertos do cache e latências por rota
+
+Uso:
+    python api.py --csv RESULTADOS_MEGASENA.csv --porta 8765
+    python api.py --binario megasena.bin --porta 8765   (base gerada por base_binaria.py)
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from base_binaria import abrir_base
+from comparacao import comparar_blocos
+from dados import estruturas_base, hash_arquivo, ler_resultados
+from estatistica import qui_quadrado_uniformidade, tabela_significancia
+from jogos import JOGOS
+from motor_atrasos import atrasos_bloco, periodos_lideranca, tabela_atrasos
+from motor_ciclos import ciclos_ate, curvas_ate
+from motor_frequencia import frequencia_bloco
+
+
+class ErroConsulta(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# Base carregada (recarrega se o arquivo mudar)
+# ------------------------------------------------------------
+def carregar_base(caminho, jogo):
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+
+    df, cols_bolas = ler_resultados(conteudo, jogo)
+    base = estruturas_base(df, cols_bolas, jogo)
+    base.update({
+        "caminho": caminho,
+        "carregar": carregar_base,
+        "mtime": os.stat(caminho).st_mtime_ns,
+        "hash": hash_arquivo(conteudo),
+    })
+    return base
+
+
+def carregar_base_binaria(caminho, jogo=None):
+    """
+    Mesma estrutura de carregar_base, a partir da base binária: todos os arrays são
+    visões do np.memmap (somente leitura, compartilhadas entre processos) e nada é
+    recalculado ao iniciar.
+    """
+    base = abrir_base(caminho)
+    base.update({
+        "caminho": caminho,
+        "carregar": carregar_base_binaria,
+        "mtime": os.stat(caminho).st_mtime_ns,
+    })
+    return base
+
+
+async def base_atual(estado):
+    """
+    Base em uso. Se o arquivo mudou, recarrega numa thread (o loop segue atendendo)
+    e as requisições que chegarem enquanto isso esperam a mesma recarga. Se o
+    arquivo sumir ou não puder ser lido, a base anterior continua valendo até a
+    próxima modificação.
+    """
+    base = estado["base"]
+    try:
+        mtime = os.stat(base["caminho"]).st_mtime_ns
+    except FileNotFoundError:
+        return base
+    if mtime in (base["mtime"], estado["mtime_invalido"]):
+        return base
+
+    if estado["recarga"] is None:
+        estado["recarga"] = asyncio.get_running_loop().run_in_executor(
+            None, base["carregar"], base["caminho"], base["jogo"]
+        )
+    recarga = estado["recarga"]
+    try:
+        nova = await asyncio.shield(recarga)
+    except Exception as e:
+        if estado["recarga"] is recarga:
+            estado["recarga"] = None
+            estado["mtime_invalido"] = mtime
+            print(f"Falha ao recarregar {base['caminho']} ({e}); mantendo a base anterior.")
+        return base
+
+    if estado["recarga"] is recarga:
+        estado["recarga"] = None
+        estado["base"] = nova
+    return estado["base"]
+
+
+# ------------------------------------------------------------
+# Consultas
+# ------------------------------------------------------------
+def _inteiro(params, nome, padrao):
+    valor = params.get(nome, [None])[0]
+    if valor in (None, ""):
+        return padrao
+    try:
+        return int(valor)
+    except ValueError:
+        raise ErroConsulta(f"Parâmetro `{nome}` deve ser um número de concurso.")
+
+
+def _intervalo(base, params, nome_ini="ini", nome_fim="fim"):
+    concursos = base["concursos"]
+    ini = _inteiro(params, nome_ini, int(concursos.min()))
+    fim = _inteiro(params, nome_fim, int(concursos.max()))
+    if ini > fim:
+        raise ErroConsulta(f"`{nome_ini}` deve ser menor ou igual a `{nome_fim}`.")
+
+    idx_ini = int(concursos.searchsorted(ini, side="left"))
+    idx_fim = int(concursos.searchsorted(fim, side="right"))
+    if idx_fim <= idx_ini:
+        raise ErroConsulta(f"Nenhum sorteio encontrado entre `{nome_ini}` e `{nome_fim}`.")
+    return ini, fim, idx_ini, idx_fim
+
+
+def _registros(df):
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def consultar_atraso(base, params):
+    ini, fim, idx_ini, idx_fim = _intervalo(base, params)
+    atrasos = atrasos_bloco(base["atrasos"], base["posicoes"], idx_ini, idx_fim)
+    periodos = periodos_lideranca(atrasos, base["concursos"][idx_ini:idx_fim])
+
+    return {
+        "ini": ini,
+        "fim": fim,
+        "sorteios": idx_fim - idx_ini,
+        "atrasos": _registros(tabela_atrasos(atrasos, periodos).reset_index(drop=True)),
+    }
+
+
+def consultar_frequencia(base, params):
+    ini, fim, idx_ini, idx_fim = _intervalo(base, params)
+    sorteios = idx_fim - idx_ini
+
+    df_freq = frequencia_bloco(base["acumuladas"], idx_ini, idx_fim)
+    df_freq = tabela_significancia(df_freq, sorteios, base["jogo"])
+    qui2, gl, p = qui_quadrado_uniformidade(df_freq["Frequência"].to_numpy(), sorteios, base["jogo"])
+
+    return {
+        "ini": ini,
+        "fim": fim,
+        "sorteios": sorteios,
+        "qui_quadrado": {"estatistica": float(qui2), "gl": gl, "p_valor": float(p)},
+        "frequencia": _registros(df_freq),
+    }
+
+
+def consultar_ciclo(base, params):
+    concursos = base["concursos"]
+    asof = _inteiro(params, "asof", int(concursos.max()))
+
+    # Ciclos fechados até `asof` são um prefixo do histórico; só o ciclo aberto é lido
+    fim = int(concursos.searchsorted(asof, side="right"))
+    if fim == 0:
+        raise ErroConsulta("Nenhum sorteio até esse concurso.")
+
+    dezenas, fechamentos, jogo = base["dezenas"], base["fechamentos"], base["jogo"]
+    df_ciclos, info = ciclos_ate(dezenas, concursos, fechamentos, fim, jogo)
+    _, _, posicao = curvas_ate(dezenas, concursos, fechamentos, base["curvas"], fim, jogo)
+
+    return {
+        "asof": asof,
+        "ciclo_atual": {
+            "Ciclo_Atual": info["Ciclo_Atual"],
+            "Inicio": info["Inicio"],
+            "Ultimo_Concurso_Base": int(info["Ultimo_Concurso_Base"]),
+            "Dezenas_Sairam": sorted(info["Dezenas_Sairam"]),
+            "Dezenas_Faltam": sorted(info["Dezenas_Faltam"]),
+            "Cobertura_Esperada": posicao["Cobertura_Esperada"],
+            "Sorteios_Esperados": posicao["Sorteios_Esperados"],
+        },
+        "ciclos": _registros(df_ciclos),
+    }
+
+
+def consultar_comparacao(base, params):
+    # Mesma validação das outras rotas: um bloco vazio é erro, não uma linha de NaN
+    blocos = []
+    for sufixo in ("a", "b"):
+        ini, fim, _, _ = _intervalo(base, params, f"ini_{sufixo}", f"fim_{sufixo}")
+        blocos.append((ini, fim))
+
+    # A comparação usa as mesmas estruturas da base: contagens, atrasos e ciclos
+    df_dezenas, df_resumo = comparar_blocos(base, *blocos)
+
+    return {
+        "bloco_a": {"ini": blocos[0][0], "fim": blocos[0][1]},
+        "bloco_b": {"ini": blocos[1][0], "fim": blocos[1][1]},
+        "resumo": _registros(df_resumo),
+        "dezenas": _registros(df_dezenas),
+    }
+
+
+# Parâmetros já resolvidos de cada rota (chave do cache): `/atraso`, `ini=1&fim=800`
+# e `ini=01` com a mesma base caem na mesma entrada
+def _chave_intervalo(base, params):
+    return _intervalo(base, params)[:2]
+
+
+def _chave_ciclo(base, params):
+    return (_inteiro(params, "asof", int(base["concursos"].max())),)
+
+
+def _chave_comparacao(base, params):
+    return tuple(_intervalo(base, params, f"ini_{s}", f"fim_{s}")[:2] for s in ("a", "b"))
+
+
+ROTAS = {
+    "/atraso": (consultar_atraso, _chave_intervalo),
+    "/frequencia": (consultar_frequencia, _chave_intervalo),
+    "/ciclo": (consultar_ciclo, _chave_ciclo),
+    "/comparar": (consultar_comparacao, _chave_comparacao),
+}
+
+
+# ------------------------------------------------------------
+# Cache LRU e métricas
+# ------------------------------------------------------------
+def novo_estado(base, tamanho_cache):
+    return {
+        "base": base,
+        "cache": OrderedDict(),
+        "tamanho_cache": tamanho_cache,
+        "metricas": {},
+        "recarga": None,          # recarga da base em andamento (future do executor)
+        "mtime_invalido": None,   # mtime de um arquivo que falhou ao recarregar
+    }
+
+
+def registrar_metrica(estado, rota, ms, acerto):
+    m = estado["metricas"].setdefault(
+        rota, {"requisicoes": 0, "acertos_cache": 0, "latencias_ms": deque(maxlen=10000)}
+    )
+    m["requisicoes"] += 1
+    m["acertos_cache"] += int(acerto)
+    m["latencias_ms"].append(ms)
+
+
+def resumo_metricas(estado):
+    resumo = {}
+    for rota, m in estado["metricas"].items():
+        p50, p95, p99, maximo = np.percentile(np.asarray(m["latencias_ms"]), [50, 95, 99, 100])
+        resumo[rota] = {
+            "requisicoes": m["requisicoes"],
+            "taxa_acerto_cache": m["acertos_cache"] / m["requisicoes"],
+            "latencia_ms": {"p50": p50, "p95": p95, "p99": p99, "max": maximo},
+        }
+    return {"cache": {"entradas": len(estado["cache"]), "tamanho": estado["tamanho_cache"]}, "rotas": resumo}
+
+
+def chave_cache(base, rota, params):
+    # (hash do arquivo, rota, parâmetros resolvidos); ErroConsulta se forem inválidos
+    _, resolver = ROTAS[rota]
+    return (base["hash"], rota) + tuple(resolver(base, params))
+
+
+def calcular(base, rota, params):
+    """
+    Executa a consulta e devolve (status, corpo JSON em bytes).
+    """
+    consulta, _ = ROTAS[rota]
+    try:
+        return 200, json.dumps(consulta(base, params), ensure_ascii=False).encode("utf-8")
+    except ErroConsulta as e:
+        return 400, json.dumps({"erro": str(e)}, ensure_ascii=False).encode("utf-8")
+    except Exception as e:
+        # Qualquer outra falha vira 500 em JSON; a conexão e o servidor seguem vivos
+        corpo = {"erro": f"Erro interno: {type(e).__name__}: {e}"}
+        return 500, json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+
+
+def guardar_no_cache(estado, chave, corpo):
+    cache = estado["cache"]
+    cache[chave] = corpo
+    if len(cache) > estado["tamanho_cache"]:
+        cache.popitem(last=False)
+
+
+async def responder(estado, rota, params):
+    """
+    Acertos do cache LRU respondem direto no loop; misses calculam numa thread e
+    guardam o corpo pronto. Cache e métricas só são tocados pelo loop.
+    """
+    base = await base_atual(estado)
+    try:
+        chave = chave_cache(base, rota, params)
+    except ErroConsulta:
+        # Parâmetro inválido: `calcular` devolve o 400 com a mesma mensagem
+        chave = None
+
+    cache = estado["cache"]
+    if chave in cache:
+        cache.move_to_end(chave)
+        return 200, cache[chave], True
+
+    status, corpo = await asyncio.get_running_loop().run_in_executor(None, calcular, base, rota, params)
+    if status == 200 and chave is not None:
+        guardar_no_cache(estado, chave, corpo)
+    return status, corpo, False
+
+
+# ------------------------------------------------------------
+# Servidor HTTP (asyncio, HTTP/1.1 com keep-alive)
+# ------------------------------------------------------------
+MOTIVOS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _resposta_http(status, corpo, manter):
+    cabecalho = (
+        f"HTTP/1.1 {status} {MOTIVOS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+    )
+    return cabecalho.encode("ascii") + corpo
+
+
+async def atender(estado, leitor, escritor):
+    try:
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                break
+
+            try:
+                metodo, alvo, versao = linha.decode("latin-1").split()
+            except ValueError:
+                break
+
+            cabecalhos = {}
+            while True:
+                h = await leitor.readline()
+                if h in (b"\r\n", b"\n", b""):
+                    break
+                nome, _, valor = h.decode("latin-1").partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip().lower()
+
+            manter = cabecalhos.get("connection", "keep-alive" if versao == "HTTP/1.1" else "close") == "keep-alive"
+
+            inicio = time.perf_counter()
+            url = urlsplit(alvo)
+            rota = url.path.rstrip("/") or "/"
+            acerto = False
+
+            if metodo != "GET":
+                status, corpo = 405, b'{"erro": "Use GET."}'
+            elif rota == "/metricas":
+                status, corpo = 200, json.dumps(resumo_metricas(estado)).encode("utf-8")
+            elif rota in ROTAS:
+                status, corpo, acerto = await responder(estado, rota, parse_qs(url.query))
+            else:
+                status, corpo = 404, json.dumps({"erro": f"Rota desconhecida: {rota}", "rotas": list(ROTAS)}).encode("utf-8")
+
+            escritor.write(_resposta_http(status, corpo, manter))
+            await escritor.drain()
+
+            # Só consultas de verdade entram nas métricas (405 não é requisição da rota)
+            if metodo == "GET" and rota in ROTAS:
+                registrar_metrica(estado, rota, (time.perf_counter() - inicio) * 1000, acerto)
+            if not manter:
+                break
+    except (ConnectionResetError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(estado, host, porta):
+    servidor = await asyncio.start_server(lambda r, w: atender(estado, r, w), host, porta)
+    print(f"API em http://{host}:{porta} — base {estado['base']['caminho']} ({len(estado['base']['concursos'])} sorteios)")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON local das análises de loteria.")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--csv", help="Arquivo CSV com os resultados")
+    origem.add_argument("--binario", help="Base binária gerada por base_binaria.py (np.memmap)")
+    parser.add_argument("--jogo", choices=list(JOGOS), default="Mega-Sena")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--cache", type=int, default=1024, help="Máximo de respostas no cache LRU")
+    args = parser.parse_args()
+
+    if args.binario:
+        base = carregar_base_binaria(args.binario)
+    else:
+        base = carregar_base(args.csv, JOGOS[args.jogo])
+
+    estado = novo_estado(base, args.cache)
+    asyncio.run(servir(estado, args.host, args.porta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Arquivos pré-calculados do CSV enviado, em cache para todas as sessões dos três
+apps: a base binária (base_binaria.py) e o relatório dos blocos padrão
+(relatorio_lote.py). Importado só depois do upload (traz numpy e pandas).
+
+A existência do arquivo é conferida fora do cache: enquanto nada foi exportado o
+resultado (None) não fica guardado, e o arquivo gravado depois aparece no próximo
+rerun. O mtime entra na chave, então um arquivo regravado é lido de novo.
+"""
+import os
+
+import streamlit as st
+
+from base_binaria import base_do_csv, caminho_base
+from dados import hash_arquivo
+from relatorio_lote import caminho_relatorio, relatorio_da_base
+
+
+def _mtime(caminho):
+    # None se o arquivo ainda não foi exportado
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        return None
+
+
+def carregar_base_binaria(conteudo, jogo):
+    # Base binária deste CSV, se existir
+    mtime = _mtime(caminho_base(hash_arquivo(conteudo)))
+    return None if mtime is None else _abrir_base_binaria(conteudo, jogo, mtime)
+
+
+def carregar_relatorio(conteudo, jogo):
+    # Relatório pré-calculado deste CSV, se existir
+    mtime = _mtime(caminho_relatorio(hash_arquivo(conteudo)))
+    return None if mtime is None else _ler_relatorio(conteudo, jogo, mtime)
+
+
+@st.cache_resource
+def _abrir_base_binaria(conteudo, jogo, mtime):
+    # Visões de np.memmap somente leitura, compartilhadas por todas as sessões sem cópia
+    return base_do_csv(conteudo, jogo)
+
+
+@st.cache_data
+def _ler_relatorio(conteudo, jogo, mtime):
+    return relatorio_da_base(conteudo, jogo)
@@ -0,0 +1,211 @@
+"""
+Base em arquivo binário de layout fixo, para abrir com np.memmap.
+
+Vários processos (workers da API, réplicas atrás do balanceador) abrem o mesmo
+arquivo somente leitura: as páginas ficam uma vez só no cache do sistema e nenhum
+processo precisa ler nem converter o CSV ao iniciar.
+
+Layout (little-endian, seções alinhadas em 64 bytes):
+    cabeçalho    CABECALHO (magic, versão, jogo, tamanhos, hash do CSV, offsets)
+    concursos    int32  [sorteios]
+    posicoes     int32  [sorteios]                 posição acumulada (gaps contam)
+    dezenas      uint8  [sorteios x bolas]         0 = valor ausente/inválido
+    acumuladas   int32  [(sorteios + 1) x universo] contagens acumuladas
+    ocorr_inicio int32  [universo + 1]             índice CSR por dezena
+    ocorr_linhas int32  [total de ocorrências]     sorteios em que cada dezena saiu
+    atrasos      uint16 [sorteios x universo]      matriz de atrasos compacta
+    fechamentos  int32  [ciclos]                   sorteio que fecha cada ciclo
+    curvas       int32  [ciclos x universo]        curva de cobertura de cada ciclo
+
+Uso:
+    python base_binaria.py exportar --csv RESULTADOS_MEGASENA.csv
+    (grava em bases/<hash>.bin, onde os apps procuram; ou --saida megasena.bin)
+    python base_binaria.py info megasena.bin
+"""
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from dados import estruturas_base, hash_arquivo, ler_resultados
+from jogos import JOGOS, MEGA_SENA
+from motor_ciclos import tabela_ciclos
+
+MAGIC = b"LOTERIA\0"
+VERSAO = 2
+ALINHAMENTO = 64
+
+SECOES = [
+    "concursos", "posicoes", "dezenas", "acumuladas", "ocorr_inicio", "ocorr_linhas",
+    "atrasos", "fechamentos", "curvas",
+]
+
+# magic, versão, universo, bolas, sorteios, ocorrências, ciclos, nome do jogo, sha256 do CSV, offsets das seções
+CABECALHO = struct.Struct("<8sIIIIII32s32s" + "Q" * len(SECOES))
+
+# Pasta onde os apps procuram a base binária do CSV enviado (um arquivo por hash)
+PASTA_BASES = os.environ.get(
+    "LOTERIA_BASES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bases")
+)
+
+
+def _formatos(universo, bolas, sorteios, ocorrencias, ciclos):
+    return {
+        "concursos": (np.int32, (sorteios,)),
+        "posicoes": (np.int32, (sorteios,)),
+        "dezenas": (np.uint8, (sorteios, bolas)),
+        "acumuladas": (np.int32, (sorteios + 1, universo)),
+        "ocorr_inicio": (np.int32, (universo + 1,)),
+        "ocorr_linhas": (np.int32, (ocorrencias,)),
+        "atrasos": (np.uint16, (sorteios, universo)),
+        "fechamentos": (np.int32, (ciclos,)),
+        "curvas": (np.int32, (ciclos, universo)),
+    }
+
+
+def caminho_base(hash_csv, pasta=PASTA_BASES):
+    return os.path.join(pasta, f"{hash_csv[:16]}.bin")
+
+
+def _alinhar(n):
+    return -(-n // ALINHAMENTO) * ALINHAMENTO
+
+
+# ------------------------------------------------------------
+# Exportação
+# ------------------------------------------------------------
+def exportar_base(conteudo_csv, caminho=None, jogo=MEGA_SENA):
+    """
+    Converte o CSV (bytes) e grava a base binária. A escrita vai para um arquivo
+    temporário e só substitui o destino no final, então leitores nunca veem um
+    arquivo pela metade.
+    """
+    hash_csv = hash_arquivo(conteudo_csv)
+    caminho = caminho or caminho_base(hash_csv)
+    df, cols_bolas = ler_resultados(conteudo_csv, jogo)
+    arrays = estruturas_base(df, cols_bolas, jogo)
+    dezenas, ocorr_linhas, fechamentos = arrays["dezenas"], arrays["ocorr_linhas"], arrays["fechamentos"]
+
+    formatos = _formatos(jogo.universo, dezenas.shape[1], len(df), len(ocorr_linhas), len(fechamentos))
+    offsets = []
+    posicao = _alinhar(CABECALHO.size)
+    for nome in SECOES:
+        offsets.append(posicao)
+        dtype, forma = formatos[nome]
+        posicao = _alinhar(posicao + np.dtype(dtype).itemsize * int(np.prod(forma)))
+
+    cabecalho = CABECALHO.pack(
+        MAGIC, VERSAO, jogo.universo, dezenas.shape[1], len(df), len(ocorr_linhas), len(fechamentos),
+        jogo.nome.encode("utf-8")[:32], bytes.fromhex(hash_csv), *offsets
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(cabecalho)
+        for nome, offset in zip(SECOES, offsets):
+            dtype, forma = formatos[nome]
+            f.seek(offset)
+            f.write(np.ascontiguousarray(arrays[nome], dtype=dtype).reshape(forma).tobytes())
+        f.truncate(posicao)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+# ------------------------------------------------------------
+# Leitura (np.memmap somente leitura, sem cópia)
+# ------------------------------------------------------------
+def abrir_base(caminho):
+    """
+    Abre a base binária. Os arrays devolvidos são visões do mesmo np.memmap
+    (mode="r"): nada é copiado e qualquer tentativa de escrita gera erro.
+    """
+    mapa = np.memmap(caminho, dtype=np.uint8, mode="r")
+    if len(mapa) < CABECALHO.size:
+        raise ValueError(f"{caminho}: arquivo menor que o cabeçalho.")
+
+    campos = CABECALHO.unpack(bytes(mapa[:CABECALHO.size]))
+    magic, versao, universo, bolas, sorteios, ocorrencias, ciclos, nome, sha256 = campos[:9]
+    offsets = campos[9:]
+
+    if magic != MAGIC:
+        raise ValueError(f"{caminho}: não é uma base binária de loteria.")
+    if versao != VERSAO:
+        raise ValueError(f"{caminho}: versão {versao} não suportada (esperada {VERSAO}).")
+
+    nome_jogo = nome.rstrip(b"\0").decode("utf-8", errors="replace")
+    if nome_jogo not in JOGOS:
+        raise ValueError(f"{caminho}: jogo desconhecido `{nome_jogo}`.")
+
+    base = {
+        "jogo": JOGOS[nome_jogo],
+        "hash": sha256.hex(),
+        "universo": universo,
+        "bolas": bolas,
+        "sorteios": sorteios,
+    }
+    formatos = _formatos(universo, bolas, sorteios, ocorrencias, ciclos)
+    for nome_secao, offset in zip(SECOES, offsets):
+        dtype, forma = formatos[nome_secao]
+        if offset + np.dtype(dtype).itemsize * int(np.prod(forma)) > len(mapa):
+            raise ValueError(f"{caminho}: arquivo truncado na seção `{nome_secao}`.")
+        base[nome_secao] = np.ndarray(forma, dtype=dtype, buffer=mapa, offset=offset)
+
+    # Mesmas chaves de `dados.estruturas_base`: só a tabela de ciclos fechados
+    # (poucas linhas) é montada
+    base["ciclos"] = tabela_ciclos(base["fechamentos"], base["concursos"])
+    return base
+
+
+def base_do_csv(conteudo_csv, jogo=MEGA_SENA, pasta=PASTA_BASES):
+    """
+    Base binária gravada para este CSV e este jogo, ou None se não houver (ou se o
+    arquivo for de outra versão ou estiver corrompido).
+    """
+    hash_csv = hash_arquivo(conteudo_csv)
+    caminho = caminho_base(hash_csv, pasta)
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        base = abrir_base(caminho)
+    except (ValueError, OSError):
+        return None
+    if base["hash"] != hash_csv or base["jogo"].nome != jogo.nome:
+        return None
+    return base
+
+
+def ocorrencias_da_dezena(base, dezena):
+    inicio = base["ocorr_inicio"]
+    return base["ocorr_linhas"][inicio[dezena - 1]:inicio[dezena]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Base binária (np.memmap) dos resultados.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    exp = sub.add_parser("exportar", help="Converte o CSV para a base binária")
+    exp.add_argument("--csv", required=True)
+    exp.add_argument("--saida", help="Arquivo .bin (padrão: bases/<hash>.bin, onde os apps procuram)")
+    exp.add_argument("--jogo", choices=list(JOGOS), default="Mega-Sena")
+
+    info = sub.add_parser("info", help="Mostra o cabeçalho de uma base binária")
+    info.add_argument("arquivo")
+
+    args = parser.parse_args()
+
+    if args.comando == "exportar":
+        with open(args.csv, "rb") as f:
+            conteudo = f.read()
+        caminho = exportar_base(conteudo, args.saida, JOGOS[args.jogo])
+        print(f"Base gravada em {caminho} ({os.path.getsize(caminho) / 1024:.0f} KB)")
+    else:
+        base = abrir_base(args.arquivo)
+        print(f"Jogo: {base['jogo'].nome} | sorteios: {base['sorteios']} | hash do CSV: {base['hash'][:16]}…")
+        print(f"Concursos {int(base['concursos'][0])} a {int(base['concursos'][-1])}")
+
+
+if __name__ == "__main__":
+    main()
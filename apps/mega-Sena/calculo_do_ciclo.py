@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+
+# Só o essencial para a tela de upload; pandas, gráficos e motores são
+# importados depois que o arquivo chega
+from jogos import JOGOS, erro_cols_bolas
 
 
 # ------------------------------------------------------------
@@ -40,11 +41,15 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# Jogo escolhido antes do título, que depende dele
+st.sidebar.header("Carregar Dados")
+jogo = JOGOS[st.sidebar.selectbox("Loteria", list(JOGOS))]
+
 # ------------------------------------------------------------
 # Título customizado da tela inicial
 # ------------------------------------------------------------
 st.markdown(
-    """
+    f"""
     <h1 style="
         font-family: 'Montserrat', sans-serif;
         font-weight: 800;
@@ -52,7 +57,7 @@ st.markdown(
         font-size: 30px;
         margin-bottom: 0.25rem;
     ">
-        Aplicativo para Cálculo dos Ciclos da Mega-Sena
+        Aplicativo para Cálculo dos Ciclos da {jogo.nome}
     </h1>
     <p style="
         font-family: 'Montserrat', sans-serif;
@@ -62,7 +67,7 @@ st.markdown(
         margin-top: 0.25rem;
         margin-bottom: 1.5rem;
     ">
-        Um ciclo se encerra quando todas as 60 dezenas foram sorteadas. 
+        Um ciclo se encerra quando todas as {jogo.universo} dezenas foram sorteadas. 
         Esta ferramenta mostra o status do ciclo atual e estatísticas de tendência central (Média, Moda, Mediana) dos ciclos passados.
     </p>
     """,
@@ -70,71 +75,63 @@ st.markdown(
 )
 
 # --- 1. Upload do Arquivo ---
-st.sidebar.header("Carregar Dados")
-uploaded_file = st.sidebar.file_uploader("Faça upload do CSV (RESULTADOS_MEGASENA.csv)", type=["csv"])
+uploaded_file = st.sidebar.file_uploader(f"Faça upload do CSV com os resultados da {jogo.nome}", type=["csv"])
 
 @st.cache_data
-def carregar_dados(file):
+def carregar_dados(file, jogo):
     try:
         df = pd.read_csv(file)
-        cols_bolas = ['Bola1', 'Bola2', 'Bola3', 'Bola4', 'Bola5', 'Bola6']
-        df[cols_bolas] = df[cols_bolas].apply(pd.to_numeric, errors='coerce')
+        erro = erro_cols_bolas(df, jogo)
+        if erro:
+            st.error(f"Erro ao processar arquivo: {erro}")
+            return None
+        df[jogo.cols_bolas] = df[jogo.cols_bolas].apply(pd.to_numeric, errors='coerce')
         return df.sort_values(by='Concurso')
     except Exception as e:
         st.error(f"Erro ao processar arquivo: {e}")
         return None
 
-def calcular_ciclos(df):
-    """
-    Percorre todos os sorteios para determinar o histórico de ciclos e o estado atual.
-    """
-    ciclos_fechados = []
-    
-    # Estado do ciclo atual
-    dezenas_no_ciclo = set()
-    inicio_ciclo = 1
-    numero_ciclo = 1
-    
-    todas_dezenas = set(range(1, 61))
-    
-    for idx, row in df.iterrows():
-        concurso = row['Concurso']
-        sorteadas = {row['Bola1'], row['Bola2'], row['Bola3'], row['Bola4'], row['Bola5'], row['Bola6']}
-        
-        dezenas_no_ciclo.update(sorteadas)
-        
-        # Verifica se completou as 60 dezenas
-        if len(dezenas_no_ciclo) == 60:
-            qtd_concursos = concurso - inicio_ciclo + 1
-            ciclos_fechados.append({
-                'Ciclo': numero_ciclo,
-                'Inicio': inicio_ciclo,
-                'Fim': concurso,
-                'Qtd_Sorteios': qtd_concursos
-            })
-            
-            # Resetar para o próximo ciclo
-            numero_ciclo += 1
-            dezenas_no_ciclo = set()
-            inicio_ciclo = concurso + 1
-            
-    # Ciclo atual (aberto)
-    ciclo_atual_info = {
-        'Ciclo_Atual': numero_ciclo,
-        'Inicio': inicio_ciclo,
-        'Dezenas_Sairam': dezenas_no_ciclo,
-        'Dezenas_Faltam': todas_dezenas - dezenas_no_ciclo,
-        'Ultimo_Concurso_Base': df['Concurso'].max()
-    }
-    
-    return pd.DataFrame(ciclos_fechados), ciclo_atual_info
+# Ciclos e curvas ficam em cache por arquivo (hash do CSV) e jogo: reruns não refazem o cálculo
+@st.cache_data
+def preparar_ciclos(hash_csv, jogo, _df):
+    return calcular_ciclos(_df, jogo)
+
+@st.cache_data
+def preparar_curvas(hash_csv, jogo, _df):
+    return calcular_curvas_cobertura(_df, jogo)
 
 if uploaded_file is not None:
-    df = carregar_dados(uploaded_file)
+    import pandas as pd
+    import plotly.graph_objects as go
+    import plotly.express as px
+
+    from arquivos_prontos import carregar_base_binaria, carregar_relatorio
+    from dados import hash_arquivo
+    from motor_ciclos import calcular_ciclos, calcular_curvas_cobertura, ciclos_ate, curvas_ate
+    from relatorio_lote import ciclos_do_relatorio, curvas_do_relatorio
+
+    df = carregar_dados(uploaded_file, jogo)
     
     if df is not None:
-        # Processamento
-        df_historico_ciclos, info_atual = calcular_ciclos(df)
+        # Processamento (histórico de ciclos e curvas vêm da base binária ou do relatório pré-calculado, se houver)
+        conteudo = uploaded_file.getvalue()
+        hash_csv = hash_arquivo(conteudo)
+        binaria = carregar_base_binaria(conteudo, jogo)
+        if binaria is not None:
+            # Base binária: ciclos fechados e curvas já gravados, só o ciclo aberto é lido
+            dezenas, concursos, fechamentos = binaria["dezenas"], binaria["concursos"], binaria["fechamentos"]
+            df_historico_ciclos, info_atual = ciclos_ate(dezenas, concursos, fechamentos, len(concursos), jogo)
+            df_curvas, curva_media, posicao_atual = curvas_ate(
+                dezenas, concursos, fechamentos, binaria["curvas"], len(concursos), jogo
+            )
+        else:
+            relatorio = carregar_relatorio(conteudo, jogo)
+            if relatorio is not None:
+                df_historico_ciclos, info_atual = ciclos_do_relatorio(relatorio)
+                df_curvas, curva_media, posicao_atual = curvas_do_relatorio(relatorio, jogo)
+            else:
+                df_historico_ciclos, info_atual = preparar_ciclos(hash_csv, jogo, df)
+                df_curvas, curva_media, posicao_atual = preparar_curvas(hash_csv, jogo, df)
         
         # --- Métricas do Topo (Status Atual) ---
         st.divider()
@@ -170,9 +167,10 @@ if uploaded_file is not None:
         
         # Preparar dados para o Grid
         grid_data = []
-        for row in range(6): 
-            for col in range(10): 
-                numero = row * 10 + (col + 1)
+        linhas_grade, colunas_grade = jogo.grade
+        for row in range(linhas_grade): 
+            for col in range(colunas_grade): 
+                numero = row * colunas_grade + (col + 1)
                 status = "Falta" if numero in info_atual['Dezenas_Faltam'] else "Saiu"
                 cor_valor = 1 if status == "Falta" else 0 
                 
@@ -210,6 +208,62 @@ if uploaded_file is not None:
         if qtd_faltam > 0:
             st.warning(f"🚨 **Dezenas que faltam sair:** {sorted(list(info_atual['Dezenas_Faltam']))}")
 
+        # --- Curva de Cobertura (k dezenas do jogo) ---
+        st.markdown("---")
+        st.subheader("📈 Curva de Cobertura do Ciclo")
+
+        if not df_curvas.empty:
+            cobertura_atual = posicao_atual['Cobertura']
+            cobertura_esperada = posicao_atual['Cobertura_Esperada']
+
+            cc1, cc2, cc3 = st.columns(3)
+            cc1.metric("Dezenas Cobertas", f"{cobertura_atual}")
+            cc2.metric(
+                "Esperado (Média Histórica)",
+                f"{cobertura_esperada}",
+                delta=f"{cobertura_atual - cobertura_esperada:+d} dezenas"
+            )
+            cc3.metric(
+                "Sorteios Médios p/ esta Cobertura",
+                f"{posicao_atual['Sorteios_Esperados']:.1f}"
+            )
+
+            fig_curva = go.Figure()
+            fig_curva.add_trace(go.Scatter(
+                x=curva_media.values,
+                y=curva_media.index,
+                mode='lines',
+                name='Média histórica',
+                line=dict(color='#1f77b4'),
+                hovertemplate="%{y} dezenas em %{x:.1f} sorteios<extra></extra>"
+            ))
+
+            curva_atual = posicao_atual['Curva'].dropna()
+            fig_curva.add_trace(go.Scatter(
+                x=curva_atual.values,
+                y=curva_atual.index,
+                mode='lines+markers',
+                name=f"Ciclo #{posicao_atual['Ciclo_Atual']}",
+                line=dict(color='#FFD700', shape='hv'),
+                hovertemplate="%{y} dezenas em %{x} sorteios<extra></extra>"
+            ))
+
+            fig_curva.update_layout(
+                height=400,
+                xaxis=dict(title="Sorteios no ciclo"),
+                yaxis=dict(title="Dezenas cobertas", range=[0, jogo.universo + 1]),
+                margin=dict(l=10, r=10, t=10, b=10),
+                plot_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig_curva, use_container_width=True)
+            if int(df['Concurso'].min()) > 1:
+                st.caption(
+                    f"A base começa no concurso {int(df['Concurso'].min())}: o primeiro ciclo começou antes "
+                    "dela e, observado só em parte, fica fora da média histórica."
+                )
+        else:
+            st.info("Ainda não há ciclos fechados para montar a curva média de cobertura.")
+
         # --- Histórico e Estatísticas (MODA E MEDIANA) ---
         st.markdown("---")
         st.subheader("📚 Histórico e Estatísticas de Duração")
@@ -269,4 +323,4 @@ if uploaded_file is not None:
             st.info("Ainda não há ciclos históricos fechados suficientes para calcular estatísticas.")
 
 else:
-    st.info("Aguardando upload do arquivo RESULTADOS_MEGASENA.csv")
\ No newline at end of file
+    st.info(f"Aguardando upload do arquivo CSV da {jogo.nome}")
\ No newline at end of file
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from estatistica import escores_z, qui_quadrado_uniformidade
+from motor_atrasos import atrasos_bloco, periodos_lideranca, tabela_atrasos
+
+
+# ------------------------------------------------------------
+# Resumo de um bloco
+# ------------------------------------------------------------
+def _ranking(valores):
+    # 1 = maior valor; empates recebem a mesma (menor) posição
+    return (valores[None, :] > valores[:, None]).sum(axis=1) + 1
+
+
+def resumo_bloco(estruturas, ini, fim):
+    """
+    Frequência, atraso atual e atraso Top1 típico de cada dezena no bloco [ini, fim],
+    mais os ciclos fechados inteiramente dentro dele. `estruturas` é o dicionário de
+    `dados.estruturas_base` ou da base binária (`base_binaria.abrir_base`).
+    """
+    jogo = estruturas["jogo"]
+    concursos = estruturas["concursos"]
+    idx_ini = int(concursos.searchsorted(ini, side="left"))
+    idx_fim = int(concursos.searchsorted(fim, side="right"))
+    sorteios = idx_fim - idx_ini
+
+    # Frequência e atraso final: uma subtração e uma linha da matriz
+    contagem = (estruturas["acumuladas"][idx_fim] - estruturas["acumuladas"][idx_ini]).astype(np.int64)
+    _, z = escores_z(contagem, sorteios, jogo)
+    _, _, p_uniformidade = qui_quadrado_uniformidade(contagem, sorteios, jogo)
+
+    atrasos = atrasos_bloco(estruturas["atrasos"], estruturas["posicoes"], idx_ini, idx_fim)
+    atraso_final = atrasos[-1] if sorteios else np.zeros(jogo.universo, dtype=np.int64)
+
+    # Períodos Top1 dependem do bloco (atrasos reiniciam no concurso inicial)
+    periodos = periodos_lideranca(atrasos, concursos[idx_ini:idx_fim])
+    top1 = tabela_atrasos(atrasos, periodos).set_index("Dezena") if sorteios else pd.DataFrame()
+    tipico = top1.get("Atraso_Top1_Tipico", pd.Series(dtype=float)).reindex(range(1, jogo.universo + 1))
+
+    ciclos = estruturas["ciclos"]
+    if not ciclos.empty:
+        ciclos = ciclos[(ciclos["Inicio"] >= ini) & (ciclos["Fim"] <= fim)]
+
+    return {
+        "ini": ini,
+        "fim": fim,
+        "sorteios": sorteios,
+        "frequencia": contagem,
+        "z": z,
+        "ranking": _ranking(contagem),
+        "atraso": atraso_final.astype(np.int64),
+        "top1_tipico": tipico.to_numpy(dtype=float),
+        "p_uniformidade": float(p_uniformidade),
+        "ciclos": ciclos["Qtd_Sorteios"] if not ciclos.empty else pd.Series(dtype=float),
+    }
+
+
+# ------------------------------------------------------------
+# Comparação lado a lado
+# ------------------------------------------------------------
+def comparar_blocos(estruturas, bloco_a, bloco_b):
+    """
+    Compara dois blocos (ini, fim). Retorna:
+    - df_dezenas: uma linha por dezena com valores de A, B e a diferença (B - A);
+    - df_resumo: indicadores gerais do bloco (sorteios, uniformidade, ciclos).
+    """
+    a = resumo_bloco(estruturas, *bloco_a)
+    b = resumo_bloco(estruturas, *bloco_b)
+
+    # Frequência por 100 sorteios, para comparar blocos de tamanhos diferentes
+    taxa_a = 100 * a["frequencia"] / max(a["sorteios"], 1)
+    taxa_b = 100 * b["frequencia"] / max(b["sorteios"], 1)
+
+    df_dezenas = pd.DataFrame({
+        "Dezena": np.arange(1, len(taxa_a) + 1),
+        "Freq_A": a["frequencia"],
+        "Freq_B": b["frequencia"],
+        "Taxa100_A": taxa_a,
+        "Taxa100_B": taxa_b,
+        "Delta_Taxa100": taxa_b - taxa_a,
+        "Z_A": a["z"],
+        "Z_B": b["z"],
+        "Rank_A": a["ranking"],
+        "Rank_B": b["ranking"],
+        # Positivo = subiu no ranking de frequência
+        "Delta_Rank": a["ranking"] - b["ranking"],
+        "Atraso_A": a["atraso"],
+        "Atraso_B": b["atraso"],
+        "Delta_Atraso": b["atraso"] - a["atraso"],
+        "Top1_Tipico_A": a["top1_tipico"],
+        "Top1_Tipico_B": b["top1_tipico"],
+        "Delta_Top1_Tipico": b["top1_tipico"] - a["top1_tipico"],
+    })
+
+    def estatisticas(r):
+        ciclos = r["ciclos"]
+        return [
+            r["sorteios"],
+            r["p_uniformidade"],
+            np.nanmedian(r["top1_tipico"]) if np.isfinite(r["top1_tipico"]).any() else np.nan,
+            len(ciclos),
+            ciclos.mean() if len(ciclos) else np.nan,
+            ciclos.median() if len(ciclos) else np.nan,
+            ciclos.min() if len(ciclos) else np.nan,
+            ciclos.max() if len(ciclos) else np.nan,
+        ]
+
+    indicadores = [
+        "Sorteios",
+        "P-valor uniformidade",
+        "Atraso Top1 típico (mediana das dezenas)",
+        "Ciclos fechados no bloco",
+        "Duração média do ciclo",
+        "Duração mediana do ciclo",
+        "Menor ciclo",
+        "Maior ciclo",
+    ]
+    valores_a = np.asarray(estatisticas(a), dtype=float)
+    valores_b = np.asarray(estatisticas(b), dtype=float)
+
+    df_resumo = pd.DataFrame({
+        "Indicador": indicadores,
+        "Bloco_A": valores_a,
+        "Bloco_B": valores_b,
+        "Diferença": valores_b - valores_a,
+    })
+
+    return df_dezenas, df_resumo
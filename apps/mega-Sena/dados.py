@@ -0,0 +1,82 @@
+import hashlib
+import io
+
+import pandas as pd
+
+from jogos import MEGA_SENA, detectar_cols_bolas, erro_cols_bolas
+from motor_atrasos import matriz_atrasos_compacta, posicoes_concursos
+from motor_ciclos import historico_ciclos, tabela_ciclos
+from motor_frequencia import contagens_acumuladas
+from sorteios import indice_ocorrencias, matriz_dezenas
+
+
+# ------------------------------------------------------------
+# Leitura da base fora do Streamlit (API, exportações, workers)
+# ------------------------------------------------------------
+def hash_arquivo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def ler_resultados(conteudo, jogo=MEGA_SENA):
+    """
+    Lê o CSV (bytes) como os apps: tenta vírgula e depois ponto-e-vírgula, converte
+    Concurso e Data e ordena por concurso. Retorna (df, cols_bolas).
+    """
+    df = None
+    for sep in [",", ";"]:
+        try:
+            df_tmp = pd.read_csv(io.BytesIO(conteudo), sep=sep)
+            if {"Concurso", "Data"}.issubset(df_tmp.columns):
+                df = df_tmp
+                break
+        except Exception:
+            continue
+    if df is None:
+        df = pd.read_csv(io.BytesIO(conteudo), sep=",")
+
+    if "Concurso" not in df.columns:
+        raise ValueError("A base precisa ter a coluna `Concurso`.")
+    erro = erro_cols_bolas(df, jogo)
+    if erro:
+        raise ValueError(erro)
+    cols_bolas = detectar_cols_bolas(df, jogo)
+
+    df["Concurso"] = pd.to_numeric(df["Concurso"], errors="coerce")
+    df = df.dropna(subset=["Concurso"])
+    df["Concurso"] = df["Concurso"].astype(int)
+    if "Data" in df.columns:
+        df["Data"] = pd.to_datetime(df["Data"], dayfirst=True, errors="coerce")
+
+    return df.sort_values("Concurso", kind="stable").reset_index(drop=True), cols_bolas
+
+
+# ------------------------------------------------------------
+# Estruturas da base inteira (calculadas uma vez por arquivo)
+# ------------------------------------------------------------
+def estruturas_base(df, cols_bolas, jogo=MEGA_SENA):
+    """
+    Tudo que as consultas por intervalo usam, para a base inteira: posições,
+    dezenas, contagens acumuladas, índice de ocorrências, matriz de atrasos
+    compacta e histórico de ciclos. Qualquer bloco é um recorte. `df` precisa estar
+    ordenado por concurso (como sai de `ler_resultados`). As chaves são as mesmas
+    da base binária (`base_binaria.abrir_base`), que grava estes arrays.
+    """
+    concursos = df["Concurso"].to_numpy()
+    posicoes = posicoes_concursos(concursos)
+    dezenas = matriz_dezenas(df, cols_bolas, jogo)
+    ocorr_inicio, ocorr_linhas = indice_ocorrencias(dezenas, jogo.universo)
+    fechamentos, curvas = historico_ciclos(dezenas, concursos, jogo)
+
+    return {
+        "jogo": jogo,
+        "concursos": concursos,
+        "posicoes": posicoes,
+        "dezenas": dezenas,
+        "acumuladas": contagens_acumuladas(df, cols_bolas, jogo),
+        "ocorr_inicio": ocorr_inicio,
+        "ocorr_linhas": ocorr_linhas,
+        "atrasos": matriz_atrasos_compacta(df, cols_bolas, jogo, posicoes),
+        "fechamentos": fechamentos,
+        "curvas": curvas,
+        "ciclos": tabela_ciclos(fechamentos, concursos),
+    }
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# Linhas processadas por vez nas comparações par a par (limita a memória em linhas x N x N)
+BLOCO_LINHAS = 512
+
+
+# ------------------------------------------------------------
+# Ranking de todas as dezenas em todas as posições
+# ------------------------------------------------------------
+def ranks_medios(valores):
+    """
+    Ranking de cada dezena em cada linha (1 = maior valor), com empates recebendo
+    o rank médio, como no Spearman.
+    """
+    valores = np.asarray(valores)
+    ranks = np.empty(valores.shape, dtype=float)
+
+    for i in range(0, len(valores), BLOCO_LINHAS):
+        v = valores[i:i + BLOCO_LINHAS]
+        maiores = (v[:, None, :] > v[:, :, None]).sum(axis=2)
+        iguais = (v[:, None, :] == v[:, :, None]).sum(axis=2)
+        ranks[i:i + BLOCO_LINHAS] = maiores + (iguais + 1) / 2
+    return ranks
+
+
+def correlacoes_consecutivas(valores):
+    """
+    Spearman e Kendall (tau-b) entre cada linha e a seguinte.
+    Retorna dois arrays de tamanho linhas - 1.
+    """
+    valores = np.asarray(valores)
+    ranks = ranks_medios(valores)
+
+    # Spearman = Pearson dos ranks
+    centrados = ranks - ranks.mean(axis=1, keepdims=True)
+    norma = np.sqrt((centrados ** 2).sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spearman = (centrados[:-1] * centrados[1:]).sum(axis=1) / (norma[:-1] * norma[1:])
+
+    # Kendall tau-b com a matriz de sinais de cada linha (pares contados duas vezes
+    # no numerador e no denominador, o que se cancela)
+    kendall = np.empty(max(len(valores) - 1, 0), dtype=float)
+    for i in range(0, len(valores) - 1, BLOCO_LINHAS):
+        v = valores[i:i + BLOCO_LINHAS + 1]
+        sinais = np.sign(v[:, :, None] - v[:, None, :]).astype(np.int8)
+        atual, seguinte = sinais[:-1].astype(np.int32), sinais[1:].astype(np.int32)
+        concordancia = (atual * seguinte).sum(axis=(1, 2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kendall[i:i + len(atual)] = concordancia / np.sqrt(
+                np.abs(atual).sum(axis=(1, 2)) * np.abs(seguinte).sum(axis=(1, 2))
+            )
+
+    return spearman, kendall
+
+
+# ------------------------------------------------------------
+# Permanência no Top k
+# ------------------------------------------------------------
+def membros_topo(valores, k=10, maiores=True):
+    """
+    Matriz booleana das k dezenas com maior (ou menor) valor em cada linha.
+    Empates são desfeitos pela menor dezena, para que a lista tenha sempre k itens.
+    """
+    valores = np.asarray(valores, dtype=np.int64)
+    universo = valores.shape[1]
+
+    chave = (-valores if maiores else valores) * (universo + 1) + np.arange(universo)
+    topo = np.argsort(chave, axis=1)[:, :k]
+
+    membros = np.zeros(valores.shape, dtype=bool)
+    membros[np.arange(len(valores))[:, None], topo] = True
+    return membros
+
+
+def persistencia_topo(membros):
+    """
+    Por dezena: quantas vezes entrou no Top, em quantas posições ficou lá e quanto
+    tempo (em posições consecutivas) cada passagem durou.
+    """
+    n, universo = membros.shape
+
+    bordas = np.zeros((n + 2, universo), dtype=np.int8)
+    bordas[1:-1] = membros
+    mudancas = np.diff(bordas, axis=0).T
+    dez_ini, idx_ini = np.nonzero(mudancas == 1)
+    _, idx_fim = np.nonzero(mudancas == -1)
+    duracoes = idx_fim - idx_ini
+
+    passagens = np.bincount(dez_ini, minlength=universo)
+    total = np.bincount(dez_ini, weights=duracoes, minlength=universo)
+    maximo = np.zeros(universo, dtype=np.int64)
+    np.maximum.at(maximo, dez_ini, duracoes)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = np.where(passagens > 0, total / passagens, np.nan)
+
+    return pd.DataFrame({
+        "Dezena": np.arange(1, universo + 1),
+        "Entradas_no_Top": passagens,
+        "Posicoes_no_Top": total.astype(np.int64),
+        "Fracao_no_Top": total / max(n, 1),
+        "Permanencia_Media": media,
+        "Permanencia_Max": maximo,
+    })
+
+
+def taxa_renovacao(membros, k=10):
+    """
+    Fração do Top k que muda de uma posição para a seguinte.
+    """
+    mantidos = (membros[:-1] & membros[1:]).sum(axis=1)
+    return 1 - mantidos / k
+
+
+# ------------------------------------------------------------
+# Análises prontas para os apps
+# ------------------------------------------------------------
+def estabilidade_frequencia(acumuladas, concursos, janela, k=10):
+    """
+    Ranking de frequência em todas as janelas deslizantes de `janela` sorteios
+    (direto das contagens acumuladas), correlação entre janelas vizinhas e
+    permanência nas listas Top k mais e menos sorteadas.
+    """
+    concursos = np.asarray(concursos)
+    if janela < 1 or janela >= len(concursos):
+        return None
+
+    contagens = acumuladas[janela:] - acumuladas[:-janela]
+    spearman, kendall = correlacoes_consecutivas(contagens)
+    quentes = membros_topo(contagens, k, maiores=True)
+    frias = membros_topo(contagens, k, maiores=False)
+
+    df_correlacoes = pd.DataFrame({
+        "Fim": concursos[janela:],
+        "Spearman": spearman,
+        "Kendall": kendall,
+        "Renovacao_Quentes": taxa_renovacao(quentes, k),
+        "Renovacao_Frias": taxa_renovacao(frias, k),
+    })
+
+    return {
+        "correlacoes": df_correlacoes,
+        "quentes": persistencia_topo(quentes),
+        "frias": persistencia_topo(frias),
+    }
+
+
+def estabilidade_atraso(atrasos, concursos, k=10):
+    """
+    Mesmas medidas para o ranking de atraso, sorteio a sorteio (Top k mais atrasadas).
+    """
+    concursos = np.asarray(concursos)
+    if len(atrasos) < 2:
+        return None
+
+    spearman, kendall = correlacoes_consecutivas(atrasos)
+    atrasadas = membros_topo(atrasos, k, maiores=True)
+
+    df_correlacoes = pd.DataFrame({
+        "Fim": concursos[1:],
+        "Spearman": spearman,
+        "Kendall": kendall,
+        "Renovacao_Top": taxa_renovacao(atrasadas, k),
+    })
+
+    return {
+        "correlacoes": df_correlacoes,
+        "atrasadas": persistencia_topo(atrasadas),
+    }
@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA
+
+
+# ------------------------------------------------------------
+# Significância das frequências (sorteio de k dezenas em N)
+# ------------------------------------------------------------
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def p_valor_normal(z):
+    """
+    P-valor bilateral da normal padrão.
+    """
+    return _erfc(np.abs(z) / math.sqrt(2))
+
+
+def p_valor_qui_quadrado(estatistica, gl):
+    """
+    P-valor da qui-quadrado pela aproximação de Wilson–Hilferty (boa para gl grande,
+    como 59 na Mega-Sena).
+    """
+    estatistica = np.asarray(estatistica, dtype=float)
+    c = 2 / (9 * gl)
+    z = (np.cbrt(estatistica / gl) - (1 - c)) / math.sqrt(c)
+    return 0.5 * _erfc(z / math.sqrt(2))
+
+
+def escores_z(contagens, sorteios, jogo=MEGA_SENA):
+    """
+    Esperado e escore z de cada contagem: cada dezena segue Binomial(sorteios, k/N).
+    Aceita uma linha (universo) ou várias janelas (janelas x universo).
+    """
+    p = jogo.bolas_por_sorteio / jogo.universo
+    sorteios = np.asarray(sorteios, dtype=float)
+    if sorteios.ndim:
+        sorteios = sorteios[:, None]
+
+    esperado = sorteios * p
+    desvio = np.sqrt(sorteios * p * (1 - p))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(desvio > 0, (contagens - esperado) / desvio, 0.0)
+    return esperado, z
+
+
+def qui_quadrado_uniformidade(contagens, sorteios, jogo=MEGA_SENA):
+    """
+    Teste de uniformidade das contagens por linha. Como as k dezenas de um sorteio
+    são distintas, a soma de (O - E)² / E é corrigida por (N - 1) / (N - k) para
+    seguir uma qui-quadrado com N - 1 graus de liberdade.
+    """
+    esperado, _ = escores_z(contagens, sorteios, jogo)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bruto = np.where(esperado > 0, (contagens - esperado) ** 2 / esperado, 0.0).sum(axis=-1)
+
+    gl = jogo.universo - 1
+    estatistica = bruto * gl / (jogo.universo - jogo.bolas_por_sorteio)
+    return estatistica, gl, p_valor_qui_quadrado(estatistica, gl)
+
+
+def tabela_significancia(df_freq, sorteios, jogo=MEGA_SENA):
+    """
+    Acrescenta Esperado, Z e P_Valor à tabela de frequência de um bloco.
+    """
+    esperado, z = escores_z(df_freq["Frequência"].to_numpy(), sorteios, jogo)
+    return df_freq.assign(
+        Esperado=np.broadcast_to(esperado, z.shape),
+        Z=z,
+        P_Valor=p_valor_normal(z),
+    )
+
+
+def varredura_janelas(acumuladas, concursos, janela, jogo=MEGA_SENA):
+    """
+    Estatísticas de todas as janelas deslizantes de `janela` sorteios, direto das
+    contagens acumuladas: qui-quadrado de uniformidade e maior |Z| de cada janela.
+    """
+    if janela < 1 or janela > len(concursos):
+        return pd.DataFrame(columns=["Inicio", "Fim", "Qui2", "P_Valor", "Z_Max", "Dezena_Z_Max"])
+
+    contagens = acumuladas[janela:] - acumuladas[:-janela]
+    sorteios = np.full(len(contagens), janela)
+
+    _, z = escores_z(contagens, sorteios, jogo)
+    estatistica, _, p = qui_quadrado_uniformidade(contagens, sorteios, jogo)
+    dezena_max = np.abs(z).argmax(axis=1)
+
+    return pd.DataFrame({
+        "Inicio": np.asarray(concursos)[:len(contagens)],
+        "Fim": np.asarray(concursos)[janela - 1:],
+        "Qui2": estatistica,
+        "P_Valor": p,
+        "Z_Max": z[np.arange(len(z)), dezena_max],
+        "Dezena_Z_Max": dezena_max + 1,
+    })
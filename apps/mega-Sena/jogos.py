@@ -0,0 +1,75 @@
+"""
+Especificação das loterias. Sem numpy/pandas: os apps importam este módulo antes
+da tela de upload.
+"""
+from dataclasses import dataclass
+
+
+# ------------------------------------------------------------
+# Especificação das loterias
+# ------------------------------------------------------------
+@dataclass(frozen=True)
+class Jogo:
+    """
+    Parâmetros de uma loteria: universo de dezenas (1..universo), bolas por sorteio,
+    formato do volante (linhas x colunas) e prefixo das colunas de bolas no CSV.
+    """
+    nome: str
+    universo: int
+    bolas_por_sorteio: int
+    grade: tuple
+    prefixo_coluna: str = "Bola"
+    # Lotomania publica a dezena 100 como "00"
+    zero_vale_universo: bool = False
+    # Dupla Sena: o CSV traz as bolas dos dois sorteios (só o 1º é analisado)
+    sorteios_por_concurso: int = 1
+
+    @property
+    def cols_bolas(self):
+        return [f"{self.prefixo_coluna}{i}" for i in range(1, self.bolas_por_sorteio + 1)]
+
+    @property
+    def palavras(self):
+        # Quantas palavras de 64 bits são necessárias para a máscara de um sorteio
+        return (self.universo + 63) // 64
+
+
+MEGA_SENA = Jogo("Mega-Sena", 60, 6, (6, 10))
+LOTOFACIL = Jogo("Lotofácil", 25, 15, (5, 5))
+QUINA = Jogo("Quina", 80, 5, (8, 10))
+# Considera apenas o 1º sorteio de cada concurso (Bola1..Bola6)
+DUPLA_SENA = Jogo("Dupla Sena", 50, 6, (5, 10), sorteios_por_concurso=2)
+LOTOMANIA = Jogo("Lotomania", 100, 20, (10, 10), zero_vale_universo=True)
+
+JOGOS = {j.nome: j for j in [MEGA_SENA, LOTOFACIL, QUINA, DUPLA_SENA, LOTOMANIA]}
+
+
+# ------------------------------------------------------------
+# Colunas de bolas no CSV
+# ------------------------------------------------------------
+def detectar_cols_bolas(df, jogo=MEGA_SENA):
+    """
+    Colunas de bolas do jogo presentes no CSV (Bola1..BolaN, sem diferenciar
+    maiúsculas), na ordem do jogo. Colunas a mais, como as do 2º sorteio da
+    Dupla Sena, ficam de fora, como no motor de ciclos.
+    """
+    por_nome = {str(c).lower(): c for c in df.columns}
+    return [por_nome[c.lower()] for c in jogo.cols_bolas if c.lower() in por_nome]
+
+
+def erro_cols_bolas(df, jogo=MEGA_SENA):
+    """
+    Mensagem de erro se faltar alguma coluna de bolas do jogo no CSV ou se houver
+    colunas de bolas além das dele (arquivo de outra loteria); None se estiver certo.
+    Sem essa checagem, um CSV da Mega-Sena aberto como Lotofácil ou Quina daria
+    números errados sem aviso.
+    """
+    nomes = {str(c).lower() for c in df.columns}
+    faltam = [c for c in jogo.cols_bolas if c.lower() not in nomes]
+    if faltam:
+        return f"Faltam as colunas de bolas da {jogo.nome}: {', '.join(faltam)}. Confira a loteria escolhida."
+
+    excedente = f"{jogo.prefixo_coluna}{jogo.bolas_por_sorteio * jogo.sorteios_por_concurso + 1}"
+    if excedente.lower() in nomes:
+        return f"O arquivo tem a coluna `{excedente}`, que não existe na {jogo.nome}. Confira a loteria escolhida."
+    return None
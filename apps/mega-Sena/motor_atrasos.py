@@ -0,0 +1,184 @@
+from statistics import multimode, median
+
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA
+from sorteios import indice_ocorrencias, matriz_dezenas
+
+# Maior atraso representável na matriz compacta (valores acima saturam)
+ATRASO_MAXIMO_COMPACTO = np.iinfo(np.uint16).max
+
+
+# ------------------------------------------------------------
+# Matriz de atrasos (sorteios x dezenas do jogo)
+# ------------------------------------------------------------
+def posicoes_concursos(concursos):
+    """
+    Posição acumulada de cada sorteio: gaps de concurso contam como múltiplos sorteios
+    e concursos repetidos (ou fora de ordem) contam como 1.
+    """
+    concursos = np.asarray(concursos, dtype=np.int64)
+    if len(concursos) == 0:
+        return concursos
+    deltas = np.maximum(np.diff(concursos), 1)
+    return np.concatenate(([1], 1 + np.cumsum(deltas)))
+
+
+def atrasos_bloco(atrasos, posicoes, inicio, fim):
+    """
+    Recorta as linhas [inicio, fim) da matriz da base inteira com os atrasos
+    reiniciados no começo do bloco, como se o bloco fosse a base toda.
+    """
+    posicoes = np.asarray(posicoes, dtype=np.int64)
+    limite = posicoes[inicio:fim] - posicoes[inicio] + 1 if fim > inicio else posicoes[:0]
+    return np.minimum(atrasos[inicio:fim], limite[:, None])
+
+
+def matriz_atrasos_compacta(df, cols_bolas, jogo=MEGA_SENA, posicoes=None):
+    """
+    Atraso de cada dezena após cada sorteio (0 = saiu neste sorteio), em uint16
+    (2 bytes por célula: ~360 KB para 3.000 sorteios da Mega-Sena). Antes da
+    primeira ocorrência o atraso conta desde o início da base.
+
+    Preenchida coluna a coluna a partir das ocorrências de cada dezena (índice CSR):
+    os temporários em int64 têm o tamanho de uma coluna, nunca o da matriz.
+    """
+    dezenas = matriz_dezenas(df, cols_bolas, jogo)
+    if posicoes is None:
+        posicoes = posicoes_concursos(df["Concurso"].to_numpy())
+    posicoes = np.asarray(posicoes, dtype=np.int64)
+
+    inicio, linhas = indice_ocorrencias(dezenas, jogo.universo)
+    sorteios = np.arange(len(dezenas))
+
+    atrasos = np.empty((len(dezenas), jogo.universo), dtype=np.uint16)
+    for d in range(jogo.universo):
+        ocorrencias = linhas[inicio[d]:inicio[d + 1]]
+        # Posição da última ocorrência até cada sorteio (0 = ainda não saiu)
+        ultima = np.concatenate(([0], posicoes[ocorrencias]))[np.searchsorted(ocorrencias, sorteios, side="right")]
+        atrasos[:, d] = np.minimum(posicoes - ultima, ATRASO_MAXIMO_COMPACTO)
+    return atrasos
+
+
+def historico_calor(atrasos, concursos, max_linhas=600):
+    """
+    Reduz a matriz de atrasos para no máximo `max_linhas` faixas de sorteios
+    consecutivos, guardando o maior atraso de cada dezena na faixa (picos não somem).
+    Retorna (matriz faixas x universo, concurso inicial de cada faixa).
+    """
+    concursos = np.asarray(concursos)
+    n = len(atrasos)
+    if n == 0:
+        return atrasos[:0], concursos[:0]
+
+    passo = -(-n // max_linhas)
+    inicios = np.arange(0, n, passo)
+    return np.maximum.reduceat(atrasos, inicios, axis=0), concursos[inicios]
+
+
+# ------------------------------------------------------------
+# Períodos de liderança (Top1) em run-length
+# ------------------------------------------------------------
+def periodos_lideranca(atrasos, concursos):
+    """
+    Intervalos contínuos em que cada dezena teve o maior atraso (> 0), com empates.
+    Uma linha por período: índices e concursos de início/fim, dezena e atraso de pico.
+    """
+    concursos = np.asarray(concursos)
+    n, universo = atrasos.shape
+
+    maximo = atrasos.max(axis=1, initial=0)
+    lideres = (atrasos == maximo[:, None]) & (maximo[:, None] > 0)
+
+    bordas = np.zeros((n + 2, universo), dtype=np.int8)
+    bordas[1:-1] = lideres
+    mudancas = np.diff(bordas, axis=0).T
+
+    # nonzero sobre a transposta ordena por dezena e depois por sorteio,
+    # então inícios e fins ficam pareados
+    dez_ini, idx_ini = np.nonzero(mudancas == 1)
+    _, idx_fim = np.nonzero(mudancas == -1)
+    idx_fim = idx_fim - 1
+
+    # Enquanto lidera o atraso só cresce: o pico é o atraso no último sorteio do período
+    periodos = pd.DataFrame({
+        'Dezena': dez_ini + 1,
+        'Inicio_Idx': idx_ini,
+        'Fim_Idx': idx_fim,
+        'Inicio': concursos[idx_ini],
+        'Fim': concursos[idx_fim],
+        'Atraso_Pico': atrasos[idx_fim, dez_ini],
+    })
+    return periodos.sort_values(['Inicio_Idx', 'Dezena'], kind='stable').reset_index(drop=True)
+
+
+def fatiar_periodos(periodos, ini, fim, atrasos, concursos):
+    """
+    Períodos que tocam o intervalo de concursos [ini, fim], recortados nas bordas.
+    `atrasos` e `concursos` são os mesmos usados em `periodos_lideranca`: num período
+    cortado em `fim`, o pico passa a ser o atraso no último sorteio dentro do intervalo.
+    """
+    concursos = np.asarray(concursos)
+    sel = periodos[(periodos['Fim'] >= ini) & (periodos['Inicio'] <= fim)].copy()
+
+    idx_ini = int(concursos.searchsorted(ini, side='left'))
+    idx_fim = int(concursos.searchsorted(fim, side='right')) - 1
+
+    sel['Inicio_Idx'] = sel['Inicio_Idx'].clip(lower=idx_ini)
+    sel['Fim_Idx'] = sel['Fim_Idx'].clip(upper=idx_fim)
+    sel['Inicio'] = sel['Inicio'].clip(lower=ini)
+    sel['Fim'] = sel['Fim'].clip(upper=fim)
+
+    # Enquanto lidera o atraso só cresce: o pico dentro do intervalo é o da última linha
+    sel['Atraso_Pico'] = np.asarray(atrasos)[sel['Fim_Idx'].to_numpy(), sel['Dezena'].to_numpy() - 1]
+    return sel
+
+
+# ------------------------------------------------------------
+# Tabela final (Moda/Mediana + min/max)
+# ------------------------------------------------------------
+def tabela_atrasos(atrasos, periodos):
+    """
+    Monta a tabela por dezena a partir do último sorteio do bloco e dos períodos Top1.
+    Dezenas com atraso atual = 0 ficam de fora.
+    """
+    universo = atrasos.shape[1]
+    atraso_final = atrasos[-1] if len(atrasos) else np.zeros(universo, dtype=np.int64)
+    picos_por_dezena = periodos.groupby('Dezena')['Atraso_Pico'].apply(list)
+
+    linhas = []
+    for d in range(1, universo + 1):
+        if atraso_final[d - 1] > 0:  # desconsidera atraso = 0
+            lista = [int(v) for v in picos_por_dezena.get(d, [])]
+
+            if len(lista) == 0:
+                atraso_tipico = None
+                min_top1 = None
+                max_top1 = None
+            else:
+                min_top1 = min(lista)
+                max_top1 = max(lista)
+
+                modos = multimode(lista)
+                freq_modo = lista.count(modos[0])
+
+                if freq_modo > 1:
+                    # Existe moda verdadeira → pega a menor moda
+                    atraso_tipico = min(modos)
+                else:
+                    # Não há moda (todos diferentes) → usa mediana
+                    atraso_tipico = median(lista)
+
+            linhas.append(
+                {
+                    "Dezena": d,
+                    "Atraso_Atual": int(atraso_final[d - 1]),
+                    "Qtde_Vezes_Top1": len(lista),
+                    "Atraso_Top1_Tipico": atraso_tipico,  # moda ou mediana
+                    "Atraso_Top1_Min": min_top1,
+                    "Atraso_Top1_Max": max_top1,
+                }
+            )
+
+    return pd.DataFrame(linhas).sort_values("Atraso_Atual", ascending=False)
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA
+from sorteios import matriz_dezenas, mascaras_bits, mascaras_inteiras
+
+
+# ------------------------------------------------------------
+# Ciclos de fechamento (todas as dezenas do jogo sorteadas)
+# ------------------------------------------------------------
+def calcular_ciclos(df, jogo=MEGA_SENA):
+    """
+    Histórico de ciclos fechados e estado do ciclo atual sobre todos os sorteios.
+    """
+    dezenas, concursos, fechamentos, _ = _historico_df(df, jogo)
+    return ciclos_ate(dezenas, concursos, fechamentos, len(concursos), jogo)
+
+
+# ------------------------------------------------------------
+# Curvas de cobertura parcial (k de todas as dezenas)
+# ------------------------------------------------------------
+def calcular_curvas_cobertura(df, jogo=MEGA_SENA):
+    """
+    Para cada ciclo, em quantos sorteios a cobertura atingiu k dezenas (k = 1..universo).
+
+    Retorna:
+    - df_curvas: uma linha por ciclo fechado, colunas 1..universo (sorteios até cobrir k dezenas),
+      sem o primeiro ciclo quando a base não começa no concurso 1 (ciclo parcial);
+    - curva_media: média histórica de cada coluna;
+    - posicao_atual: cobertura do ciclo aberto e sua posição em relação à curva média.
+    """
+    dezenas, concursos, fechamentos, curvas = _historico_df(df, jogo)
+    return curvas_ate(dezenas, concursos, fechamentos, curvas, len(concursos), jogo)
+
+
+def _historico_df(df, jogo):
+    dezenas = matriz_dezenas(df, jogo.cols_bolas, jogo)
+    concursos = df['Concurso'].to_numpy()
+    return (dezenas, concursos) + historico_ciclos(dezenas, concursos, jogo)
+
+
+# ------------------------------------------------------------
+# Histórico numa passada (também gravado na base binária): ciclos e curvas até
+# qualquer sorteio sem percorrer a base de novo
+# ------------------------------------------------------------
+def _varrer_ciclos(dezenas, concursos, inicio_ciclo, jogo):
+    """
+    O loop de ciclos (OR das máscaras e contagem de bits) sobre os sorteios dados,
+    com o primeiro ciclo começando no concurso `inicio_ciclo`. Retorna (linhas que
+    fecham ciclos, curva de cada ciclo fechado, curva parcial do ciclo aberto,
+    dezenas cobertas nele).
+    """
+    universo = jogo.universo
+    fechamentos = []
+    curvas = []
+    linha = np.full(universo, np.nan)
+    acumulado = 0
+    cobertas = 0
+
+    mascaras = mascaras_inteiras(mascaras_bits(np.asarray(dezenas), jogo))
+    for i, (concurso, mascara) in enumerate(zip(np.asarray(concursos).tolist(), mascaras)):
+        acumulado |= mascara
+        total = acumulado.bit_count()
+
+        # Um sorteio pode cobrir várias dezenas novas de uma vez
+        if total > cobertas:
+            linha[cobertas:total] = concurso - inicio_ciclo + 1
+            cobertas = total
+
+        if cobertas == universo:
+            fechamentos.append(i)
+            curvas.append(linha)
+            linha = np.full(universo, np.nan)
+            acumulado = 0
+            cobertas = 0
+            inicio_ciclo = concurso + 1
+
+    return fechamentos, curvas, linha, cobertas
+
+
+def historico_ciclos(dezenas, concursos, jogo=MEGA_SENA):
+    """
+    Numa passada: linha do sorteio que fecha cada ciclo e a curva de cobertura de
+    cada ciclo fechado (sorteios até cobrir k dezenas, k = 1..universo).
+    `dezenas` é a matriz de `matriz_dezenas`. Retorna (fechamentos [ciclos],
+    curvas [ciclos x universo]), ambos int64.
+    """
+    fechamentos, curvas, _, _ = _varrer_ciclos(dezenas, concursos, _primeiro_concurso(concursos), jogo)
+    return (
+        np.asarray(fechamentos, dtype=np.int64),
+        np.asarray(curvas, dtype=np.int64).reshape(len(curvas), jogo.universo),
+    )
+
+
+def _primeiro_concurso(concursos):
+    # O primeiro ciclo começa no primeiro concurso da base. Se ele não for o
+    # concurso 1, esse ciclo começou antes da base e só foi observado em parte
+    return int(concursos[0]) if len(concursos) else 1
+
+
+def _primeiro_ciclo_parcial(concursos):
+    return _primeiro_concurso(concursos) > 1
+
+
+def tabela_ciclos(fechamentos, concursos):
+    """
+    Histórico de ciclos fechados no formato de `calcular_ciclos`.
+    """
+    if len(fechamentos) == 0:
+        return pd.DataFrame()
+    fim = np.asarray(concursos, dtype=np.int64)[np.asarray(fechamentos)]
+    inicio = np.concatenate(([_primeiro_concurso(concursos)], fim[:-1] + 1))
+    return pd.DataFrame({
+        'Ciclo': np.arange(1, len(fim) + 1),
+        'Inicio': inicio,
+        'Fim': fim,
+        'Qtd_Sorteios': fim - inicio + 1,
+    })
+
+
+def _ciclo_aberto(concursos, fechamentos, fim):
+    # Ciclos fechados até o sorteio `fim` (exclusive) e linha onde o aberto começa
+    fechados = int(np.searchsorted(fechamentos, fim, side='left'))
+    linha_inicio = int(fechamentos[fechados - 1]) + 1 if fechados else 0
+    inicio_ciclo = int(concursos[linha_inicio - 1]) + 1 if fechados else _primeiro_concurso(concursos)
+    return fechados, linha_inicio, inicio_ciclo
+
+
+def ciclos_ate(dezenas, concursos, fechamentos, fim, jogo=MEGA_SENA):
+    """
+    Mesmo resultado de `calcular_ciclos` sobre os `fim` primeiros sorteios: os
+    ciclos fechados são um prefixo de `fechamentos` e só o ciclo aberto é lido.
+    """
+    concursos = np.asarray(concursos)
+    fechados, linha_inicio, inicio_ciclo = _ciclo_aberto(concursos, fechamentos, fim)
+
+    abertas = np.asarray(dezenas[linha_inicio:fim])
+    dezenas_no_ciclo = {int(d) for d in np.unique(abertas[abertas > 0])}
+    info = {
+        'Ciclo_Atual': fechados + 1,
+        'Inicio': inicio_ciclo,
+        'Dezenas_Sairam': dezenas_no_ciclo,
+        'Dezenas_Faltam': set(range(1, jogo.universo + 1)) - dezenas_no_ciclo,
+        'Ultimo_Concurso_Base': concursos[:fim].max() if fim else np.nan,
+    }
+    return tabela_ciclos(fechamentos[:fechados], concursos), info
+
+
+def curvas_ate(dezenas, concursos, fechamentos, curvas, fim, jogo=MEGA_SENA):
+    """
+    Mesmo resultado de `calcular_curvas_cobertura` sobre os `fim` primeiros sorteios,
+    a partir das curvas gravadas: só o ciclo aberto é percorrido. Se a base não
+    começa no concurso 1, o primeiro ciclo (observado só em parte) fica fora de
+    `df_curvas` e da curva média.
+    """
+    universo = jogo.universo
+    concursos = np.asarray(concursos)
+    fechados, linha_inicio, inicio_ciclo = _ciclo_aberto(concursos, fechamentos, fim)
+
+    primeiro = min(int(_primeiro_ciclo_parcial(concursos)), fechados)
+    df_curvas = pd.DataFrame(
+        np.asarray(curvas[primeiro:fechados], dtype=float),
+        index=pd.Index(range(primeiro + 1, fechados + 1), name='Ciclo'),
+        columns=range(1, universo + 1)
+    )
+    curva_media = df_curvas.mean()
+
+    # Curva parcial do ciclo aberto (não fecha nenhum ciclo até `fim`)
+    _, _, linha, cobertas = _varrer_ciclos(dezenas[linha_inicio:fim], concursos[linha_inicio:fim], inicio_ciclo, jogo)
+
+    sorteios_atual = int(concursos[:fim].max()) - inicio_ciclo + 1 if fim else 0
+
+    if df_curvas.empty:
+        cobertura_esperada = None
+        sorteios_esperados = None
+    else:
+        cobertura_esperada = int((curva_media <= sorteios_atual).sum())
+        sorteios_esperados = float(curva_media[cobertas]) if cobertas > 0 else 0.0
+
+    posicao_atual = {
+        'Ciclo_Atual': fechados + 1,
+        'Inicio': inicio_ciclo,
+        'Sorteios': sorteios_atual,
+        'Cobertura': cobertas,
+        'Curva': pd.Series(linha, index=range(1, universo + 1)),
+        'Cobertura_Esperada': cobertura_esperada,
+        'Sorteios_Esperados': sorteios_esperados,
+    }
+    return df_curvas, curva_media, posicao_atual
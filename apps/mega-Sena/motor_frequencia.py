@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA
+from sorteios import matriz_dezenas
+
+
+# ------------------------------------------------------------
+# Frequência das dezenas
+# ------------------------------------------------------------
+def calcular_frequencia(df, cols_bolas, jogo=MEGA_SENA):
+    """
+    Quantas vezes cada dezena (1..universo) aparece nas colunas de bolas do bloco.
+    """
+    dezenas = matriz_dezenas(df, cols_bolas, jogo)
+    contagem = np.bincount(dezenas.ravel(), minlength=jogo.universo + 1)[1:]
+
+    return pd.DataFrame(
+        {
+            "Dezena": list(range(1, jogo.universo + 1)),
+            "Frequência": contagem
+        }
+    )
+
+
+def contagens_acumuladas(df, cols_bolas, jogo=MEGA_SENA):
+    """
+    Contagem acumulada por dezena ((sorteios + 1) x universo): a linha i soma os i
+    primeiros sorteios, então um bloco [inicio, fim) custa uma subtração.
+    """
+    dezenas = matriz_dezenas(df, cols_bolas, jogo)
+
+    # Coluna 0 recebe os valores inválidos e é descartada
+    por_sorteio = np.zeros((len(df), jogo.universo + 1), dtype=np.int32)
+    linhas = np.broadcast_to(np.arange(len(df))[:, None], dezenas.shape)
+    np.add.at(por_sorteio, (linhas, dezenas), 1)
+
+    acumuladas = np.zeros((len(df) + 1, jogo.universo), dtype=np.int32)
+    np.cumsum(por_sorteio[:, 1:], axis=0, out=acumuladas[1:])
+    return acumuladas
+
+
+def frequencia_bloco(acumuladas, inicio, fim):
+    contagem = acumuladas[fim] - acumuladas[inicio]
+    return pd.DataFrame(
+        {
+            "Dezena": list(range(1, len(contagem) + 1)),
+            "Frequência": contagem.astype(np.int64)
+        }
+    )
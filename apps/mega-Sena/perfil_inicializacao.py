@@ -0,0 +1,169 @@
+"""
+Perfil do tempo de inicialização dos apps (cold start).
+
+1. Custo de importar cada módulo num interpretador novo, já com o streamlit
+   carregado (como no servidor), incluindo o primeiro acesso aos atributos que
+   os apps usam: mediana de várias execuções.
+2. Para cada app: tempo até a tela de upload, quais módulos pesados já foram
+   carregados nesse ponto e, com --csv, tempo da primeira execução com o arquivo.
+
+Uso:
+    python perfil_inicializacao.py --csv RESULTADOS_MEGASENA.csv
+    python perfil_inicializacao.py --detalhe pandas    (árvore do -X importtime)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+MODULOS = [
+    "numpy",
+    "pandas",
+    "altair",
+    "plotly.graph_objects",
+    "plotly.express",
+    "matplotlib.pyplot",
+    "jogos",
+    "sorteios",
+    "dados",
+    "estatistica",
+    "motor_atrasos",
+    "motor_frequencia",
+    "motor_ciclos",
+    "comparacao",
+    "estabilidade_ranking",
+    "relatorio_lote",
+]
+
+# Atributos que os apps usam: módulos com submódulos preguiçosos (plotly.graph_objects)
+# só carregam as classes no primeiro acesso, então o acesso entra na medição
+ATRIBUTOS = {
+    "plotly.graph_objects": ["Figure", "Bar", "Scatter", "Heatmap"],
+    "plotly.express": ["bar"],
+    "altair": ["Chart", "X", "Y", "Color", "Scale"],
+}
+
+# Módulos cuja presença antes do upload indica import desnecessário na tela inicial
+PESADOS = ["numpy", "pandas", "altair", "plotly.express", "matplotlib"]
+
+APPS = ["Calcula_Atraso_Dezenas.py", "Calcula_ranking_Frequencia_Dezenas.py", "calculo_do_ciclo.py"]
+
+CODIGO_MODULO = """
+import importlib, json, sys, time
+import streamlit
+inicio = time.perf_counter()
+modulo = importlib.import_module(sys.argv[1])
+for atributo in json.loads(sys.argv[2]):
+    getattr(modulo, atributo)
+print(json.dumps(time.perf_counter() - inicio))
+"""
+
+CODIGO_APP = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app, csv, pesados = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+at = AppTest.from_file(app, default_timeout=120)
+
+inicio = time.perf_counter()
+at.run()
+resultado = {
+    "upload": time.perf_counter() - inicio,
+    "carregados": [m for m in pesados if m in sys.modules],
+    "excecao": bool(at.exception),
+}
+
+if csv:
+    with open(csv, "rb") as f:
+        conteudo = f.read()
+    inicio = time.perf_counter()
+    at.file_uploader[0].set_value(("resultados.csv", conteudo, "text/csv")).run()
+    resultado["primeira_analise"] = time.perf_counter() - inicio
+    resultado["excecao"] = resultado["excecao"] or bool(at.exception)
+
+print(json.dumps(resultado))
+"""
+
+
+def _executar(codigo, *args):
+    # Interpretador novo a cada medição: nada herdado do cache de módulos
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo, *args],
+        cwd=PASTA, capture_output=True, text=True, check=True,
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def perfil_modulos(repeticoes):
+    return {
+        modulo: statistics.median(_executar(CODIGO_MODULO, modulo, json.dumps(ATRIBUTOS.get(modulo, []))) for _ in range(repeticoes))
+        for modulo in MODULOS
+    }
+
+
+def perfil_apps(csv, repeticoes):
+    resultados = {}
+    for app in APPS:
+        medicoes = [_executar(CODIGO_APP, app, csv or "", json.dumps(PESADOS)) for _ in range(repeticoes)]
+        resultados[app] = {
+            "upload": statistics.median(m["upload"] for m in medicoes),
+            "primeira_analise": statistics.median(m["primeira_analise"] for m in medicoes) if csv else None,
+            "carregados": medicoes[-1]["carregados"],
+            "excecao": any(m["excecao"] for m in medicoes),
+        }
+    return resultados
+
+
+def detalhe_importacao(modulo, linhas=15):
+    """
+    Maiores tempos próprios (self) do -X importtime ao importar `modulo`.
+    """
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=PASTA, capture_output=True, text=True, check=True,
+    )
+    registros = []
+    for linha in saida.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        registros.append((int(proprio), int(acumulado), nome.strip()))
+
+    registros.sort(reverse=True)
+    print(f"{'próprio (ms)':>13} {'acumulado (ms)':>15}  módulo")
+    for proprio, acumulado, nome in registros[:linhas]:
+        print(f"{proprio / 1000:13.1f} {acumulado / 1000:15.1f}  {nome}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação por módulo e tempo até a tela de upload.")
+    parser.add_argument("--csv", help="CSV para medir também a primeira análise após o upload")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--detalhe", help="Mostra a árvore do -X importtime de um módulo e sai")
+    args = parser.parse_args()
+
+    if args.detalhe:
+        detalhe_importacao(args.detalhe)
+        return
+
+    print("Importação com streamlit já carregado (mediana):")
+    for modulo, segundos in sorted(perfil_modulos(args.repeticoes).items(), key=lambda x: -x[1]):
+        print(f"  {modulo:<22} {segundos * 1000:8.1f} ms")
+
+    print("\nApps (interpretador novo):")
+    for app, r in perfil_apps(args.csv, args.repeticoes).items():
+        linha = f"  {app:<40} upload em {r['upload'] * 1000:7.0f} ms"
+        if r["primeira_analise"] is not None:
+            linha += f" | primeira análise {r['primeira_analise'] * 1000:7.0f} ms"
+        print(linha)
+        print(f"    carregados antes do upload: {', '.join(r['carregados']) or 'nenhum pesado'}")
+        if r["excecao"]:
+            print("    ⚠️ o app gerou exceção durante a medição")
+
+
+if __name__ == "__main__":
+    main()
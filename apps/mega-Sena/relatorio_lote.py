@@ -0,0 +1,285 @@
+"""
+Relatórios pré-calculados para os blocos padrão (últimos 50/100/200/500 sorteios e
+histórico completo), gerados numa única passada e gravados num único .zip.
+
+As estruturas da base inteira (matriz de atrasos, contagens acumuladas, ciclos) são
+calculadas uma vez e cada bloco é só um recorte delas. Os apps procuram o relatório
+pelo hash do CSV enviado e, se o bloco selecionado for um dos padrão, mostram as
+tabelas gravadas sem recalcular. O app de ciclos lê daqui o histórico, o ciclo
+atual e as curvas de cobertura.
+
+Conteúdo do arquivo:
+    manifesto.json            jogo, hash do CSV, ciclo atual (com a posição na curva) e lista de blocos
+    curvas.csv                curva de cobertura de cada ciclo (df_curvas do app de ciclos)
+    <bloco>/atrasos.csv       tabela de atrasos (df_res do app de atraso)
+    <bloco>/frequencia.csv    frequência + significância (df_freq do app de frequência)
+    <bloco>/ciclos.csv        ciclos fechados inteiramente dentro do bloco
+
+Uso:
+    python relatorio_lote.py --csv RESULTADOS_MEGASENA.csv
+    (grava em relatorios/<hash>.zip, onde os apps procuram)
+"""
+import argparse
+import io
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from dados import estruturas_base, hash_arquivo, ler_resultados
+from estatistica import tabela_significancia
+from jogos import JOGOS, MEGA_SENA
+from motor_atrasos import atrasos_bloco, periodos_lideranca, tabela_atrasos
+from motor_ciclos import ciclos_ate, curvas_ate
+from motor_frequencia import frequencia_bloco
+
+VERSAO = 3
+
+# Quantidade de sorteios de cada bloco padrão (None = histórico completo)
+BLOCOS_PADRAO = {
+    "ultimos_50": 50,
+    "ultimos_100": 100,
+    "ultimos_200": 200,
+    "ultimos_500": 500,
+    "historico": None,
+}
+
+# Nome de cada bloco padrão no seletor dos apps
+ROTULOS_BLOCOS = {
+    "ultimos_50": "Últimos 50 sorteios",
+    "ultimos_100": "Últimos 100 sorteios",
+    "ultimos_200": "Últimos 200 sorteios",
+    "ultimos_500": "Últimos 500 sorteios",
+    "historico": "Histórico completo",
+}
+
+# Pasta onde os apps procuram os relatórios (um arquivo por hash de CSV)
+PASTA_RELATORIOS = os.environ.get(
+    "LOTERIA_RELATORIOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "relatorios")
+)
+
+TABELAS = ["atrasos", "frequencia", "ciclos"]
+COLUNAS_CICLOS = ["Ciclo", "Inicio", "Fim", "Qtd_Sorteios"]
+
+
+def caminho_relatorio(hash_csv, pasta=PASTA_RELATORIOS):
+    return os.path.join(pasta, f"{hash_csv[:16]}.zip")
+
+
+# ------------------------------------------------------------
+# Cálculo de todos os blocos numa passada
+# ------------------------------------------------------------
+def calcular_relatorios(df_ord, cols_bolas, jogo=MEGA_SENA, blocos=BLOCOS_PADRAO):
+    """
+    Tabelas de atraso, frequência e ciclos de cada bloco padrão. `df_ord` precisa
+    estar ordenado por concurso. Retorna (ciclo_atual, curvas de cobertura da base
+    inteira, {bloco: dict}).
+    """
+    # Estruturas compartilhadas por todos os blocos
+    base = estruturas_base(df_ord, cols_bolas, jogo)
+    concursos, posicoes = base["concursos"], base["posicoes"]
+    atrasos_base, acumuladas, df_ciclos = base["atrasos"], base["acumuladas"], base["ciclos"]
+    n = len(concursos)
+    _, info_atual = ciclos_ate(base["dezenas"], concursos, base["fechamentos"], n, jogo)
+    df_curvas, _, posicao = curvas_ate(base["dezenas"], concursos, base["fechamentos"], base["curvas"], n, jogo)
+
+    resultados = {}
+    for nome, tamanho in blocos.items():
+        if n == 0 or (tamanho is not None and tamanho > n):
+            continue
+
+        # O bloco é o intervalo de concursos que o app usaria: repetições do
+        # concurso inicial entram inteiras
+        ini = int(concursos[0 if tamanho is None else n - tamanho])
+        fim = int(concursos[-1])
+        idx_ini = int(concursos.searchsorted(ini, side="left"))
+        sorteios = n - idx_ini
+
+        atrasos = atrasos_bloco(atrasos_base, posicoes, idx_ini, n)
+        df_res = tabela_atrasos(atrasos, periodos_lideranca(atrasos, concursos[idx_ini:]))
+
+        df_freq = tabela_significancia(frequencia_bloco(acumuladas, idx_ini, n), sorteios, jogo)
+
+        # O primeiro ciclo começa no primeiro concurso da base: no histórico completo entram todos
+        ciclos = pd.DataFrame(columns=COLUNAS_CICLOS)
+        if not df_ciclos.empty:
+            ciclos = df_ciclos[(df_ciclos["Inicio"] >= ini) & (df_ciclos["Fim"] <= fim)]
+        duracoes = ciclos["Qtd_Sorteios"] if not ciclos.empty else pd.Series(dtype=float)
+
+        resultados[nome] = {
+            "ini": ini,
+            "fim": fim,
+            "sorteios": sorteios,
+            "atrasos": df_res.reset_index(drop=True),
+            "frequencia": df_freq,
+            "ciclos": ciclos.reset_index(drop=True),
+            "resumo_ciclos": {
+                "Fechados": len(duracoes),
+                "Media": float(duracoes.mean()) if len(duracoes) else None,
+                "Mediana": float(duracoes.median()) if len(duracoes) else None,
+                "Minimo": int(duracoes.min()) if len(duracoes) else None,
+                "Maximo": int(duracoes.max()) if len(duracoes) else None,
+            },
+        }
+
+    ciclo_atual = {
+        "Ciclo_Atual": int(info_atual["Ciclo_Atual"]),
+        "Inicio": int(info_atual["Inicio"]),
+        "Dezenas_Sairam": sorted(int(d) for d in info_atual["Dezenas_Sairam"]),
+        "Dezenas_Faltam": sorted(int(d) for d in info_atual["Dezenas_Faltam"]),
+        "Ultimo_Concurso_Base": int(info_atual["Ultimo_Concurso_Base"]),
+        # Posição na curva de cobertura: a curva do ciclo aberto só tem as k primeiras dezenas
+        "Sorteios": int(posicao["Sorteios"]),
+        "Curva": [int(x) for x in posicao["Curva"].dropna()],
+        "Cobertura_Esperada": posicao["Cobertura_Esperada"],
+        "Sorteios_Esperados": posicao["Sorteios_Esperados"],
+    }
+    return ciclo_atual, df_curvas, resultados
+
+
+# ------------------------------------------------------------
+# Gravação e leitura do arquivo
+# ------------------------------------------------------------
+def exportar_relatorios(conteudo_csv, caminho=None, jogo=MEGA_SENA):
+    """
+    Calcula os blocos padrão do CSV (bytes) e grava o .zip. A escrita vai para um
+    arquivo temporário e só substitui o destino no final.
+    """
+    hash_csv = hash_arquivo(conteudo_csv)
+    caminho = caminho or caminho_relatorio(hash_csv)
+    df, cols_bolas = ler_resultados(conteudo_csv, jogo)
+    ciclo_atual, df_curvas, resultados = calcular_relatorios(df, cols_bolas, jogo)
+
+    manifesto = {
+        "versao": VERSAO,
+        "jogo": jogo.nome,
+        "hash": hash_csv,
+        "ciclo_atual": ciclo_atual,
+        "blocos": {
+            nome: {chave: r[chave] for chave in ("ini", "fim", "sorteios", "resumo_ciclos")}
+            for nome, r in resultados.items()
+        },
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with zipfile.ZipFile(temporario, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("manifesto.json", json.dumps(manifesto, ensure_ascii=False, indent=1))
+        z.writestr("curvas.csv", df_curvas.reset_index().to_csv(index=False))
+        for nome, r in resultados.items():
+            for tabela in TABELAS:
+                z.writestr(f"{nome}/{tabela}.csv", r[tabela].to_csv(index=False))
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def ler_relatorios(caminho):
+    """
+    Lê o .zip inteiro (poucos KB): manifesto com as tabelas de cada bloco já em DataFrame.
+    Os floats são lidos com `round_trip`, iguais bit a bit aos calculados pelo app.
+    """
+    with zipfile.ZipFile(caminho) as z:
+        manifesto = json.loads(z.read("manifesto.json"))
+        if manifesto.get("versao") != VERSAO:
+            raise ValueError(f"{caminho}: versão {manifesto.get('versao')} não suportada (esperada {VERSAO}).")
+
+        manifesto["curvas"] = _ler_csv(z, "curvas.csv").set_index("Ciclo")
+
+        for nome, bloco in manifesto["blocos"].items():
+            for tabela in TABELAS:
+                bloco[tabela] = _ler_csv(z, f"{nome}/{tabela}.csv")
+    return manifesto
+
+
+def _ler_csv(z, nome):
+    return pd.read_csv(io.BytesIO(z.read(nome)), float_precision="round_trip")
+
+
+def relatorio_da_base(conteudo_csv, jogo=MEGA_SENA, pasta=PASTA_RELATORIOS):
+    """
+    Relatório gravado para este CSV e este jogo, ou None se não houver. Um arquivo
+    corrompido, de outra versão ou incompleto também dá None: o app recalcula.
+    """
+    hash_csv = hash_arquivo(conteudo_csv)
+    caminho = caminho_relatorio(hash_csv, pasta)
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        relatorio = ler_relatorios(caminho)
+        if relatorio["hash"] != hash_csv or relatorio["jogo"] != jogo.nome:
+            return None
+    except (ValueError, KeyError, zipfile.BadZipFile, OSError):
+        return None
+    return relatorio
+
+
+def bloco_do_relatorio(relatorio, ini, fim):
+    """
+    Bloco padrão com exatamente o intervalo de concursos [ini, fim], ou None.
+    """
+    if relatorio is None:
+        return None
+    for bloco in relatorio["blocos"].values():
+        if bloco["ini"] == ini and bloco["fim"] == fim:
+            return bloco
+    return None
+
+
+def ciclos_do_relatorio(relatorio):
+    """
+    Histórico de ciclos e ciclo atual no formato de `calcular_ciclos`.
+    """
+    atual = relatorio["ciclo_atual"]
+    info = {chave: atual[chave] for chave in ("Ciclo_Atual", "Inicio", "Ultimo_Concurso_Base")}
+    info["Dezenas_Sairam"] = set(atual["Dezenas_Sairam"])
+    info["Dezenas_Faltam"] = set(atual["Dezenas_Faltam"])
+    historico = relatorio["blocos"]["historico"]["ciclos"] if "historico" in relatorio["blocos"] else pd.DataFrame()
+    return historico, info
+
+
+def curvas_do_relatorio(relatorio, jogo=MEGA_SENA):
+    """
+    Curvas de cobertura, curva média e posição do ciclo atual no formato de
+    `calcular_curvas_cobertura`.
+    """
+    universo = jogo.universo
+    df_curvas = relatorio["curvas"].astype(float)
+    df_curvas.columns = df_curvas.columns.astype(int)
+
+    atual = relatorio["ciclo_atual"]
+    curva = pd.Series(np.nan, index=range(1, universo + 1))
+    curva.iloc[:len(atual["Curva"])] = atual["Curva"]
+    posicao_atual = {
+        'Ciclo_Atual': atual["Ciclo_Atual"],
+        'Inicio': atual["Inicio"],
+        'Sorteios': atual["Sorteios"],
+        'Cobertura': len(atual["Curva"]),
+        'Curva': curva,
+        'Cobertura_Esperada': atual["Cobertura_Esperada"],
+        'Sorteios_Esperados': atual["Sorteios_Esperados"],
+    }
+    return df_curvas, df_curvas.mean(), posicao_atual
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os relatórios dos blocos padrão num único .zip.")
+    parser.add_argument("--csv", required=True)
+    parser.add_argument("--saida", help="Arquivo .zip (padrão: relatorios/<hash>.zip, onde os apps procuram)")
+    parser.add_argument("--jogo", choices=list(JOGOS), default="Mega-Sena")
+    args = parser.parse_args()
+
+    with open(args.csv, "rb") as f:
+        conteudo = f.read()
+
+    caminho = exportar_relatorios(conteudo, args.saida, JOGOS[args.jogo])
+    relatorio = ler_relatorios(caminho)
+    print(f"Relatório gravado em {caminho} ({os.path.getsize(caminho) / 1024:.0f} KB)")
+    for nome, bloco in relatorio["blocos"].items():
+        print(f"  {nome}: concursos {bloco['ini']} a {bloco['fim']} ({bloco['sorteios']} sorteios)")
+
+
+if __name__ == "__main__":
+    main()
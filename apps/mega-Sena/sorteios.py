@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA
+
+
+# ------------------------------------------------------------
+# Conversão dos sorteios
+# ------------------------------------------------------------
+def matriz_dezenas(df, cols_bolas, jogo=MEGA_SENA):
+    """
+    Matriz inteira (sorteios x bolas) com as dezenas válidas; 0 marca valor ausente
+    ou fora de 1..universo.
+    """
+    bolas = df[cols_bolas].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    validas = np.isfinite(bolas)
+    dezenas = np.where(validas, np.trunc(bolas), 0).astype(np.int64)
+
+    if jogo.zero_vale_universo:
+        dezenas = np.where(validas & (dezenas == 0), jogo.universo, dezenas)
+
+    validas &= (dezenas >= 1) & (dezenas <= jogo.universo)
+    return np.where(validas, dezenas, 0)
+
+
+def indice_ocorrencias(dezenas, universo):
+    """
+    Índice CSR: ocorr_linhas[ocorr_inicio[d-1]:ocorr_inicio[d]] são os sorteios
+    (em ordem) em que a dezena d saiu.
+    """
+    linhas = np.broadcast_to(np.arange(len(dezenas))[:, None], dezenas.shape)
+    validas = dezenas > 0
+
+    # Uma ocorrência por (sorteio, dezena), mesmo que a bola venha repetida na linha
+    pares = np.unique(dezenas[validas].astype(np.int64) * len(dezenas) + linhas[validas])
+    dezena_par = pares // max(len(dezenas), 1)
+    linha_par = pares % max(len(dezenas), 1)
+
+    inicio = np.zeros(universo + 1, dtype=np.int32)
+    np.cumsum(np.bincount(dezena_par, minlength=universo + 1)[1:], out=inicio[1:])
+    return inicio, linha_par.astype(np.int32)
+
+
+def mascaras_bits(dezenas, jogo=MEGA_SENA):
+    """
+    Máscara de bits de cada sorteio em palavras de 64 bits (sorteios x jogo.palavras):
+    o bit (d-1) % 64 da palavra (d-1) // 64 indica a dezena d.
+    """
+    n = len(dezenas)
+    mascaras = np.zeros((n, jogo.palavras), dtype=np.uint64)
+
+    validas = dezenas > 0
+    bit = np.where(validas, dezenas - 1, 0)
+    palavra = bit // 64
+    valores = np.where(validas, np.left_shift(np.uint64(1), (bit % 64).astype(np.uint64)), np.uint64(0))
+
+    linhas = np.broadcast_to(np.arange(n)[:, None], dezenas.shape)
+    np.bitwise_or.at(mascaras, (linhas.ravel(), palavra.ravel()), valores.ravel())
+    return mascaras
+
+
+def mascaras_inteiras(mascaras):
+    """
+    Junta as palavras de cada máscara num inteiro Python (OR e contagem de bits
+    sem custo de objeto numpy por sorteio, para qualquer largura).
+    """
+    inteiras = [0] * len(mascaras)
+    for j, coluna in enumerate(mascaras.T.tolist()):
+        deslocamento = 64 * j
+        inteiras = [m | (p << deslocamento) for m, p in zip(inteiras, coluna)]
+    return inteiras
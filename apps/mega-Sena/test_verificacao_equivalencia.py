@@ -0,0 +1,49 @@
+"""
+Entrada do pytest para verificacao_equivalencia.py: um número fixo de sementes de
+cada verificação. Para rodar mais casos use o script:
+    python verificacao_equivalencia.py --casos 500
+"""
+import numpy as np
+import pytest
+
+from motor_ciclos import calcular_curvas_cobertura
+from verificacao_equivalencia import DIFERENCAS_ESPERADAS, VERIFICACOES, gerar_historico, verificar_caso
+
+SEMENTES = range(40)
+
+
+@pytest.mark.parametrize("nome", list(VERIFICACOES))
+def test_motores_iguais_a_logica_original(nome):
+    falhas = {}
+    for semente in SEMENTES:
+        _, diferencas, _ = verificar_caso(nome, semente)
+        if diferencas:
+            falhas[semente] = diferencas[:3]
+    assert not falhas
+
+
+def test_ciclos_passam_pelas_diferencas_esperadas():
+    # Os históricos têm NaN, valores fora de 1..60 e bases que não começam no
+    # concurso 1: todas as regras precisam aparecer
+    encontradas = set()
+    for semente in SEMENTES:
+        encontradas |= verificar_caso("ciclos", semente)[2]
+    assert encontradas == set(DIFERENCAS_ESPERADAS)
+
+
+def test_base_que_nao_comeca_no_concurso_1_deixa_o_primeiro_ciclo_fora_da_curva():
+    # Histórico desde o concurso 1 com pelo menos dois ciclos fechados, e o mesmo
+    # histórico renumerado a partir do concurso 2001
+    rng = np.random.default_rng(0)
+    curvas = []
+    while len(curvas) < 2:
+        df = gerar_historico(rng)
+        df["Concurso"] -= df["Concurso"].iloc[0] - 1
+        curvas, _, posicao = calcular_curvas_cobertura(df)
+
+    curvas_recorte, media_recorte, posicao_recorte = calcular_curvas_cobertura(df.assign(Concurso=df["Concurso"] + 2000))
+
+    assert curvas_recorte.equals(curvas.iloc[1:])
+    assert media_recorte.equals(curvas.iloc[1:].mean())
+    assert posicao_recorte["Cobertura"] == posicao["Cobertura"]
+    assert posicao_recorte["Cobertura_Esperada"] is not None
@@ -0,0 +1,507 @@
+"""
+Teste de carga local dos apps Streamlit.
+
+Sobe UM servidor `streamlit run` por app e conecta N clientes websocket headless ao
+mesmo servidor. Cada cliente fala o protocolo do navegador: pede a execução do
+script, envia o CSV pela rota de upload e repete o fluxo de uso (movimentos do
+slider de concursos, troca da dezena do termômetro, checkboxes). As sessões dividem
+o runtime, o st.cache_data e a memória do servidor, como num deploy de verdade.
+
+Os números de capacidade vêm só do processo do servidor: RSS antes e depois das
+sessões, pico (VmHWM) e chamadas/misses do cache compartilhado (o servidor roda com
+st.cache_data instrumentado). Os clientes medem apenas a latência de cada interação,
+do pedido de rerun até o fim do script.
+
+Precisa do pacote `websockets` (pip install websockets), que não vem com o Streamlit.
+Os clientes usam as mensagens internas do Streamlit (streamlit.proto), que mudam
+entre versões: o script foi escrito e testado com o Streamlit 1.66.
+
+Uso:
+    python teste_carga.py --csv RESULTADOS_MEGASENA.csv --sessoes 20
+    python teste_carga.py --sintetico 3000 --sessoes 50 --apps atraso frequencia
+"""
+import argparse
+import asyncio
+import functools
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urljoin
+
+import requests
+import streamlit as st
+
+try:
+    import websockets
+except ImportError:
+    sys.exit("teste_carga.py precisa do pacote `websockets`, que não vem com o Streamlit: pip install websockets")
+
+try:
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+except ImportError as e:
+    sys.exit(f"Mensagens internas do Streamlit {st.__version__} incompatíveis com o teste de carga ({e}).")
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+# Versão do Streamlit com que o protocolo dos clientes foi testado
+STREAMLIT_TESTADO = "1.66"
+
+APPS = {
+    "atraso": "Calcula_Atraso_Dezenas.py",
+    "frequencia": "Calcula_ranking_Frequencia_Dezenas.py",
+    "ciclo": "calculo_do_ciclo.py",
+}
+
+
+# ------------------------------------------------------------
+# Base de teste
+# ------------------------------------------------------------
+def gerar_base_sintetica(qtd_sorteios, semente=0):
+    # numpy/pandas só aqui: o servidor importa este módulo e o RSS inicial dele
+    # não deve incluir bibliotecas que o app só carrega após o upload
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(semente)
+    bolas = np.sort(rng.random((qtd_sorteios, 60)).argsort(axis=1)[:, :6] + 1, axis=1)
+
+    df = pd.DataFrame(bolas, columns=[f"Bola{i}" for i in range(1, 7)])
+    df.insert(0, "Concurso", np.arange(1, qtd_sorteios + 1))
+    df.insert(1, "Data", pd.date_range("1996-03-11", periods=qtd_sorteios, freq="3D").strftime("%d/%m/%Y"))
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+# ------------------------------------------------------------
+# Lado do servidor
+# ------------------------------------------------------------
+CHAMADAS_CACHE = {"chamadas": 0, "misses": 0}
+_TRAVA_CACHE = threading.Lock()
+
+
+def _contar(campo):
+    # As sessões rodam em threads do mesmo servidor
+    with _TRAVA_CACHE:
+        CHAMADAS_CACHE[campo] += 1
+
+
+def instrumentar_cache():
+    """
+    Troca st.cache_data por uma versão que conta chamadas e misses (o corpo da
+    função só executa quando o valor não está no cache). A chave do cache não muda:
+    functools.wraps preserva nome, módulo e código-fonte da função original.
+    """
+    cache_data_original = st.cache_data
+
+    def cache_data_contado(func=None, **kwargs):
+        if func is None:
+            return lambda f: cache_data_contado(f, **kwargs)
+
+        @functools.wraps(func)
+        def corpo(*args, **kw):
+            _contar("misses")
+            return func(*args, **kw)
+
+        em_cache = cache_data_original(corpo, **kwargs)
+
+        @functools.wraps(func)
+        def chamada(*args, **kw):
+            _contar("chamadas")
+            return em_cache(*args, **kw)
+
+        chamada.clear = em_cache.clear
+        return chamada
+
+    st.cache_data = cache_data_contado
+
+
+# Servidor num interpretador próprio: o mesmo bootstrap do `streamlit run`, com o
+# cache instrumentado antes do primeiro script. Ao receber SIGTERM o servidor para,
+# bootstrap.run retorna e os contadores vão para o arquivo de estatísticas.
+CODIGO_SERVIDOR = """
+import json, sys
+from streamlit.web import bootstrap
+import teste_carga
+
+app, porta, estatisticas = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+opcoes = {
+    "server_port": porta,
+    "server_headless": True,
+    "server_fileWatcherType": "none",
+    "server_enableXsrfProtection": False,
+    "browser_gatherUsageStats": False,
+}
+teste_carga.instrumentar_cache()
+bootstrap.load_config_options(opcoes)
+bootstrap.run(app, False, [], opcoes)
+with open(estatisticas, "w") as f:
+    json.dump(teste_carga.CHAMADAS_CACHE, f)
+"""
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memoria_processo_mb(pid):
+    """
+    RSS atual e pico (VmHWM) de outro processo, via /proc. Fora do Linux: (None, None).
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            campos = dict(linha.split(":", 1) for linha in f if ":" in linha)
+        return int(campos["VmRSS"].split()[0]) / 1024, int(campos["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def iniciar_servidor(app, porta, estatisticas, tempo_limite):
+    processo = subprocess.Popen(
+        [sys.executable, "-c", CODIGO_SERVIDOR, APPS[app], str(porta), estatisticas],
+        cwd=PASTA, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url_saude = f"http://127.0.0.1:{porta}/_stcore/health"
+    limite = time.perf_counter() + tempo_limite
+    while time.perf_counter() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"{app}: o servidor terminou antes de ficar pronto (código {processo.returncode}).")
+        try:
+            if requests.get(url_saude, timeout=1).ok:
+                return processo
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError(f"{app}: o servidor não respondeu em {tempo_limite:.0f}s.")
+
+
+def parar_servidor(processo, estatisticas):
+    processo.terminate()
+    try:
+        processo.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+        processo.wait()
+    try:
+        with open(estatisticas) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ------------------------------------------------------------
+# Cliente headless (protocolo do navegador)
+# ------------------------------------------------------------
+class ClienteStreamlit:
+    """
+    Uma aba do navegador: conexão websocket com o servidor, estado dos widgets e
+    elementos da última execução do script.
+    """
+
+    def __init__(self, porta, tempo_limite):
+        self.url_http = f"http://127.0.0.1:{porta}/"
+        self.url_ws = f"ws://127.0.0.1:{porta}/_stcore/stream"
+        self.tempo_limite = tempo_limite
+        self.ws = None
+        self.sessao = None
+        self.widgets = []   # elementos de widget da última execução, na ordem da tela
+        self.estados = {}   # id do widget -> WidgetState enviado ao servidor
+
+    async def conectar(self):
+        self.ws = await websockets.connect(self.url_ws, subprotocols=["streamlit"], max_size=None)
+
+    async def fechar(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _receber(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.tempo_limite))
+        return msg
+
+    async def executar(self):
+        """
+        Pede um rerun com o estado atual dos widgets e espera o fim do script.
+        Retorna a duração em segundos.
+        """
+        pedido = BackMsg()
+        pedido.rerun_script.query_string = ""
+        pedido.rerun_script.page_script_hash = ""
+        pedido.rerun_script.widget_states.widgets.extend(self.estados.values())
+
+        inicio = time.perf_counter()
+        await self.ws.send(pedido.SerializeToString())
+
+        widgets, erros = [], []
+        while True:
+            msg = await self._receber()
+            tipo = msg.WhichOneof("type")
+            if tipo == "new_session":
+                self.sessao = msg.new_session.initialize.session_id
+            elif tipo == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                elemento = msg.delta.new_element
+                nome = elemento.WhichOneof("type")
+                if nome == "exception":
+                    erros.append(elemento.exception.message)
+                elif nome in ("slider", "radio", "checkbox", "selectbox", "file_uploader"):
+                    widgets.append((nome, getattr(elemento, nome)))
+            elif tipo == "script_finished":
+                break
+        duracao = time.perf_counter() - inicio
+
+        if erros:
+            raise RuntimeError(erros[0])
+
+        # Widgets que sumiram da tela (ou mudaram de id) saem do estado, como no navegador
+        self.widgets = widgets
+        ids = {w.id for _, w in widgets}
+        self.estados = {i: e for i, e in self.estados.items() if i in ids}
+        return duracao
+
+    def widget(self, tipo, rotulo=None):
+        for nome, w in self.widgets:
+            if nome == tipo and (rotulo is None or w.label == rotulo):
+                return w
+        return None
+
+    def _estado(self, widget):
+        estado = self.estados.get(widget.id)
+        if estado is None:
+            estado = self.estados[widget.id] = WidgetState(id=widget.id)
+        return estado
+
+    async def enviar_arquivo(self, nome, conteudo):
+        """
+        Mesmo caminho do navegador: pede a URL de upload pelo websocket, faz o PUT
+        multipart e marca o arquivo no estado do file_uploader.
+        """
+        pedido = BackMsg()
+        pedido.file_urls_request.request_id = "1"
+        pedido.file_urls_request.file_names.append(nome)
+        pedido.file_urls_request.session_id = self.sessao
+        await self.ws.send(pedido.SerializeToString())
+
+        while True:
+            msg = await self._receber()
+            if msg.WhichOneof("type") == "file_urls_response":
+                break
+        resposta = msg.file_urls_response
+        if resposta.error_msg:
+            raise RuntimeError(resposta.error_msg)
+        urls = resposta.file_urls[0]
+
+        envio = await asyncio.to_thread(
+            requests.put, urljoin(self.url_http, urls.upload_url),
+            files={"file": (nome, conteudo, "text/csv")}, timeout=self.tempo_limite,
+        )
+        envio.raise_for_status()
+
+        estado = self._estado(self.widget("file_uploader"))
+        info = estado.file_uploader_state_value.uploaded_file_info.add()
+        info.name, info.size, info.file_id = nome, len(conteudo), urls.file_id
+        info.file_urls.CopyFrom(urls)
+
+
+# ------------------------------------------------------------
+# Fluxos de uso
+# ------------------------------------------------------------
+def mover_slider(cliente, rng):
+    slider = cliente.widget("slider")
+    minimo, maximo = int(slider.min), int(slider.max)
+    tamanho = rng.choice([50, 100, 200, 500, maximo - minimo])
+    fim = rng.randint(minimo + min(tamanho, maximo - minimo), maximo)
+    estado = cliente._estado(slider)
+    estado.double_array_value.data[:] = [max(minimo, fim - tamanho), fim]
+
+
+def trocar_dezena(cliente, rng):
+    radio = cliente.widget("radio")
+    if radio is not None:
+        cliente._estado(radio).string_value = rng.choice(list(radio.options))
+
+
+def _alternar_checkbox(cliente, rotulo):
+    checkbox = cliente.widget("checkbox", rotulo)
+    if checkbox is not None:
+        estado = cliente._estado(checkbox)
+        atual = estado.bool_value if estado.HasField("bool_value") else checkbox.default
+        estado.bool_value = not atual
+
+
+def alternar_varredura(cliente, rng):
+    _alternar_checkbox(cliente, "Calcular para todas as janelas")
+
+
+def alternar_comparacao(cliente, rng):
+    _alternar_checkbox(cliente, "Comparar com outro bloco")
+
+
+def recarregar(cliente, rng):
+    # Qualquer interação sem mudar widgets de análise: o script roda de novo inteiro
+    pass
+
+
+PASSOS = {
+    "atraso": [mover_slider, trocar_dezena],
+    "frequencia": [mover_slider, alternar_varredura, alternar_comparacao],
+    "ciclo": [recarregar],
+}
+
+
+async def executar_sessao(porta, app, conteudo_csv, passos, semente, tempo_limite, largada):
+    """
+    Uma sessão de usuário: abre o app, envia o CSV e repete os passos do fluxo.
+    Retorna a lista de (passo, segundos).
+    """
+    rng = random.Random(semente)
+    cliente = ClienteStreamlit(porta, tempo_limite)
+    tempos = []
+    try:
+        await cliente.conectar()
+
+        # Todas as sessões começam juntas
+        await largada.wait()
+
+        tempos.append(("abrir", await cliente.executar()))
+
+        await cliente.enviar_arquivo("resultados.csv", conteudo_csv)
+        tempos.append(("upload", await cliente.executar()))
+
+        fluxo = PASSOS[app]
+        for i in range(passos):
+            passo = fluxo[i % len(fluxo)]
+            passo(cliente, rng)
+            tempos.append((passo.__name__, await cliente.executar()))
+    finally:
+        await cliente.fechar()
+    return tempos
+
+
+async def _executar_sessoes(porta, app, conteudo_csv, sessoes, passos, tempo_limite):
+    largada = asyncio.Event()
+    tarefas = [
+        asyncio.create_task(executar_sessao(porta, app, conteudo_csv, passos, semente, tempo_limite, largada))
+        for semente in range(sessoes)
+    ]
+    # Dá tempo de todas as conexões abrirem antes da largada
+    await asyncio.sleep(0.5)
+    largada.set()
+    return await asyncio.gather(*tarefas)
+
+
+def percentis(valores):
+    if not valores:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordenados = sorted(valores)
+
+    def p(q):
+        return ordenados[min(len(ordenados) - 1, int(round(q * (len(ordenados) - 1))))]
+
+    return {"p50": p(0.50), "p95": p(0.95), "p99": p(0.99), "max": ordenados[-1]}
+
+
+def testar_app(app, conteudo_csv, sessoes, passos, tempo_limite):
+    porta = porta_livre()
+    with tempfile.TemporaryDirectory() as pasta:
+        estatisticas = os.path.join(pasta, "cache.json")
+        servidor = iniciar_servidor(app, porta, estatisticas, tempo_limite)
+        try:
+            rss_inicial, _ = memoria_processo_mb(servidor.pid)
+
+            inicio = time.perf_counter()
+            resultados = asyncio.run(_executar_sessoes(porta, app, conteudo_csv, sessoes, passos, tempo_limite))
+            duracao = time.perf_counter() - inicio
+
+            rss_final, rss_pico = memoria_processo_mb(servidor.pid)
+        finally:
+            cache = parar_servidor(servidor, estatisticas)
+
+    por_passo = {}
+    for tempos in resultados:
+        for nome, segundos in tempos:
+            por_passo.setdefault(nome, []).append(segundos * 1000)
+
+    chamadas = cache["chamadas"] if cache else 0
+    misses = cache["misses"] if cache else 0
+
+    return {
+        "app": app,
+        "sessoes": sessoes,
+        "execucoes": sum(len(t) for t in resultados),
+        "duracao_s": duracao,
+        "por_passo": {nome: percentis(v) | {"n": len(v)} for nome, v in por_passo.items()},
+        "rss_inicial_mb": rss_inicial,
+        "rss_final_mb": rss_final,
+        "rss_pico_mb": rss_pico,
+        "cache_chamadas": chamadas,
+        "cache_misses": misses,
+        "cache_taxa_acerto": 1 - misses / chamadas if chamadas else None,
+    }
+
+
+# ------------------------------------------------------------
+# Relatório
+# ------------------------------------------------------------
+def imprimir_relatorio(r):
+    print(f"\n=== {r['app']} — {r['sessoes']} sessões, {r['execucoes']} execuções em {r['duracao_s']:.1f}s ===")
+    print(f"{'passo':<20}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for nome, p in r["por_passo"].items():
+        print(f"{nome:<20}{p['n']:>6}{p['p50']:>10.0f}{p['p95']:>10.0f}{p['p99']:>10.0f}{p['max']:>10.0f}")
+
+    if r["rss_inicial_mb"] is not None:
+        aumento = r["rss_final_mb"] - r["rss_inicial_mb"]
+        print(
+            f"RSS do servidor: {r['rss_inicial_mb']:.0f} MB → {r['rss_final_mb']:.0f} MB "
+            f"(+{aumento:.0f} MB, {aumento / r['sessoes']:.1f} MB por sessão; pico {r['rss_pico_mb']:.0f} MB)"
+        )
+    else:
+        print("RSS do servidor: indisponível (requer /proc)")
+    if r["cache_taxa_acerto"] is not None:
+        print(
+            f"Cache compartilhado: {r['cache_chamadas']} chamadas, {r['cache_misses']} misses, "
+            f"taxa de acerto {r['cache_taxa_acerto']:.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga local dos apps Streamlit.")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--csv", help="Arquivo CSV com os resultados")
+    origem.add_argument("--sintetico", type=int, metavar="SORTEIOS", help="Gera uma base aleatória com N sorteios")
+    parser.add_argument("--sessoes", type=int, default=10, help="Sessões simultâneas por app (no mesmo servidor)")
+    parser.add_argument("--passos", type=int, default=10, help="Interações por sessão após o upload")
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--tempo-limite", type=float, default=60.0, help="Tempo máximo de cada execução (s)")
+    args = parser.parse_args()
+
+    if not st.__version__.startswith(f"{STREAMLIT_TESTADO}."):
+        print(
+            f"⚠️ Streamlit {st.__version__}: o teste de carga foi feito para o {STREAMLIT_TESTADO}; "
+            "se as sessões falharem, o protocolo interno pode ter mudado."
+        )
+
+    if args.csv:
+        with open(args.csv, "rb") as f:
+            conteudo_csv = f.read()
+    else:
+        conteudo_csv = gerar_base_sintetica(args.sintetico)
+
+    for app in args.apps:
+        imprimir_relatorio(testar_app(app, conteudo_csv, args.sessoes, args.passos, args.tempo_limite))
+
+
+if __name__ == "__main__":
+    main()
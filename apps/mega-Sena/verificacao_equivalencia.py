@@ -0,0 +1,532 @@
+"""
+Verificação de equivalência entre os motores vetorizados e os loops originais.
+
+Gera históricos aleatórios (gaps de concurso, bolas NaN, valores fora de 1..60,
+linhas duplicadas e bases que não começam no concurso 1), roda a lógica original
+dos apps como referência e compara campo a campo com os motores atuais:
+
+- atrasos: loop `iterrows` com a regra moda/mediana de `Atraso_Top1_Tipico`, contra
+  a matriz densa e a compacta (uint16) recortadas por `atrasos_bloco`;
+- frequência: caminho `value_counts` do app de frequência;
+- ciclos: `calcular_ciclos` original (conjuntos de dezenas), com NaN e valores
+  fora de 1..60. As mudanças de regra conhecidas aparecem como diferenças
+  esperadas, com nome (DIFERENCAS_ESPERADAS), e não como falha;
+- ciclos_gravados: histórico gravado na base binária (`ciclos_ate`/`curvas_ate`,
+  que também servem `calcular_ciclos`/`calcular_curvas_cobertura`) num prefixo da
+  base, contra referências com conjuntos só de dezenas válidas.
+
+Uso:
+    python verificacao_equivalencia.py --casos 500 --semente 0
+
+Sai com código 1 se encontrar diferença não explicada, mostrando a semente do caso
+para reproduzir. `test_verificacao_equivalencia.py` roda um número fixo de sementes
+pelo pytest.
+"""
+import argparse
+import math
+import sys
+from statistics import multimode, median
+
+import numpy as np
+import pandas as pd
+
+from jogos import MEGA_SENA, detectar_cols_bolas
+from motor_atrasos import (
+    atrasos_bloco,
+    matriz_atrasos_compacta,
+    periodos_lideranca,
+    posicoes_concursos,
+    tabela_atrasos,
+)
+from motor_ciclos import calcular_ciclos, calcular_curvas_cobertura, ciclos_ate, curvas_ate, historico_ciclos
+from motor_frequencia import calcular_frequencia, contagens_acumuladas, frequencia_bloco
+from sorteios import matriz_dezenas
+
+
+# ------------------------------------------------------------
+# Referências (lógica original dos apps, sem alterações de regra)
+# ------------------------------------------------------------
+def referencia_atrasos(df_filtrado, cols_bolas):
+    todas_dezenas = list(range(1, 61))
+
+    atraso = {d: 0 for d in todas_dezenas}
+    in_lead = {d: False for d in todas_dezenas}
+    streaks_top1 = {d: 0 for d in todas_dezenas}
+    atrasos_max_por_periodo = {d: [] for d in todas_dezenas}
+    current_period_max = {d: 0 for d in todas_dezenas}
+
+    prev_conc = None
+
+    for _, row in df_filtrado.iterrows():
+        conc = int(row["Concurso"])
+
+        if prev_conc is None:
+            delta = 1
+        else:
+            delta = conc - prev_conc
+            if delta < 1:
+                delta = 1
+
+        for d in todas_dezenas:
+            atraso[d] += delta
+
+        for col in cols_bolas:
+            dez = pd.to_numeric(row[col], errors="coerce")
+            if pd.notna(dez):
+                dez_int = int(dez)
+                if dez_int in atraso:
+                    atraso[dez_int] = 0
+
+        max_atraso = max(atraso.values())
+        if max_atraso <= 0:
+            for d in todas_dezenas:
+                in_lead[d] = False
+            prev_conc = conc
+            continue
+
+        leaders = [d for d, a in atraso.items() if a == max_atraso and a > 0]
+
+        for d in todas_dezenas:
+            if d in leaders:
+                if not in_lead[d]:
+                    streaks_top1[d] += 1
+                    current_period_max[d] = atraso[d]
+                    in_lead[d] = True
+                else:
+                    current_period_max[d] = max(current_period_max[d], atraso[d])
+            else:
+                if in_lead[d]:
+                    if current_period_max[d] > 0:
+                        atrasos_max_por_periodo[d].append(current_period_max[d])
+                    current_period_max[d] = 0
+                in_lead[d] = False
+
+        prev_conc = conc
+
+    for d in todas_dezenas:
+        if in_lead[d] and current_period_max[d] > 0:
+            atrasos_max_por_periodo[d].append(current_period_max[d])
+            current_period_max[d] = 0
+
+    linhas = []
+    for d in todas_dezenas:
+        if atraso[d] > 0:
+            lista = atrasos_max_por_periodo[d]
+
+            if len(lista) == 0:
+                atraso_tipico = None
+                min_top1 = None
+                max_top1 = None
+            else:
+                min_top1 = min(lista)
+                max_top1 = max(lista)
+
+                modos = multimode(lista)
+                freq_modo = lista.count(modos[0])
+
+                if freq_modo > 1:
+                    atraso_tipico = min(modos)
+                else:
+                    atraso_tipico = median(lista)
+
+            linhas.append(
+                {
+                    "Dezena": d,
+                    "Atraso_Atual": atraso[d],
+                    "Qtde_Vezes_Top1": streaks_top1[d],
+                    "Atraso_Top1_Tipico": atraso_tipico,
+                    "Atraso_Top1_Min": min_top1,
+                    "Atraso_Top1_Max": max_top1,
+                }
+            )
+
+    return pd.DataFrame(linhas).sort_values("Atraso_Atual", ascending=False)
+
+
+def referencia_frequencia(df_filtrado, cols_bolas):
+    valores = df_filtrado[cols_bolas].values.ravel()
+    series_dezenas = pd.to_numeric(pd.Series(valores), errors="coerce").dropna().astype(int)
+
+    todas_dezenas = range(1, 61)
+    freq = series_dezenas.value_counts().reindex(todas_dezenas, fill_value=0)
+
+    return pd.DataFrame(
+        {
+            "Dezena": list(freq.index),
+            "Frequência": freq.values
+        }
+    )
+
+
+# Regras em que o motor de ciclos diverge de propósito do original
+DIFERENCAS_ESPERADAS = {
+    "nan_conta_como_dezena": (
+        "no original cada bola NaN entra no conjunto como um elemento distinto e pode "
+        "fechar o ciclo antes das 60 dezenas; as máscaras de bits ignoram NaN"
+    ),
+    "fora_da_faixa_conta_como_dezena": (
+        "no original valores fora de 1..60 (0, 61, -3, ...) entram no conjunto e contam "
+        "para as 60; as máscaras de bits descartam esses valores"
+    ),
+    "primeiro_ciclo_no_concurso_1": (
+        "no original o primeiro ciclo sempre começa no concurso 1; o motor o começa no "
+        "primeiro concurso da base (uma base que não começa no 1 só vê parte desse ciclo)"
+    ),
+}
+
+# Opção de `referencia_ciclos` que desliga cada regra de DIFERENCAS_ESPERADAS
+OPCOES_DIFERENCAS = {
+    "nan_conta_como_dezena": "ignorar_nan",
+    "fora_da_faixa_conta_como_dezena": "ignorar_fora_da_faixa",
+    "primeiro_ciclo_no_concurso_1": "inicio_na_base",
+}
+
+
+def referencia_ciclos(df, ignorar_nan=False, ignorar_fora_da_faixa=False, inicio_na_base=False):
+    """
+    `calcular_ciclos` original. As opções só servem para atribuir uma divergência a
+    uma das DIFERENCAS_ESPERADAS: sem elas a lógica é exatamente a dos apps.
+    """
+    ciclos_fechados = []
+
+    dezenas_no_ciclo = set()
+    inicio_ciclo = int(df['Concurso'].iloc[0]) if inicio_na_base and len(df) else 1
+    numero_ciclo = 1
+
+    todas_dezenas = set(range(1, 61))
+
+    for idx, row in df.iterrows():
+        concurso = row['Concurso']
+        sorteadas = {row['Bola1'], row['Bola2'], row['Bola3'], row['Bola4'], row['Bola5'], row['Bola6']}
+        if ignorar_nan:
+            sorteadas = {x for x in sorteadas if x == x}
+        if ignorar_fora_da_faixa:
+            # NaN fica (o filtro de NaN é independente)
+            sorteadas = {x for x in sorteadas if x != x or 1 <= x <= 60}
+
+        dezenas_no_ciclo.update(sorteadas)
+
+        if len(dezenas_no_ciclo) == 60:
+            qtd_concursos = concurso - inicio_ciclo + 1
+            ciclos_fechados.append({
+                'Ciclo': numero_ciclo,
+                'Inicio': inicio_ciclo,
+                'Fim': concurso,
+                'Qtd_Sorteios': qtd_concursos
+            })
+
+            numero_ciclo += 1
+            dezenas_no_ciclo = set()
+            inicio_ciclo = concurso + 1
+
+    ciclo_atual_info = {
+        'Ciclo_Atual': numero_ciclo,
+        'Inicio': inicio_ciclo,
+        'Dezenas_Sairam': dezenas_no_ciclo,
+        'Dezenas_Faltam': todas_dezenas - dezenas_no_ciclo,
+        'Ultimo_Concurso_Base': df['Concurso'].max()
+    }
+
+    return pd.DataFrame(ciclos_fechados), ciclo_atual_info
+
+
+def matriz_ocorrencias(df, cols_bolas, jogo=MEGA_SENA):
+    """
+    Matriz booleana (sorteios x universo): True onde a dezena saiu no sorteio.
+    """
+    dezenas = matriz_dezenas(df, cols_bolas, jogo)
+
+    # Coluna 0 recebe os valores inválidos e é descartada
+    ocorrencias = np.zeros((len(df), jogo.universo + 1), dtype=bool)
+    linhas = np.broadcast_to(np.arange(len(df))[:, None], dezenas.shape)
+    ocorrencias[linhas, dezenas] = True
+    return ocorrencias[:, 1:]
+
+
+def matriz_atrasos(ocorrencias, posicoes):
+    """
+    Matriz de atrasos densa (int64) pelo acumulado da última ocorrência: a versão
+    direta, usada para conferir a compacta do motor.
+    """
+    posicoes = np.asarray(posicoes, dtype=np.int64)
+    ultima = np.where(ocorrencias, posicoes[:, None], 0)
+    ultima = np.maximum.accumulate(ultima, axis=0) if len(posicoes) else ultima
+    return posicoes[:, None] - ultima
+
+
+def referencia_curvas(df):
+    """
+    Curvas de cobertura com conjuntos, só com dezenas válidas: para cada ciclo,
+    sorteios até cobrir k dezenas. O primeiro ciclo começa no primeiro concurso da
+    base e, se ela não começa no concurso 1, fica fora das curvas e da média.
+    Retorna (curvas dos ciclos fechados, posição do ciclo aberto no formato de
+    `posicao_atual`, com a curva sem os NaN).
+    """
+    curvas = []
+    linha = []
+    dezenas_no_ciclo = set()
+    inicio_ciclo = int(df['Concurso'].iloc[0])
+    parcial = inicio_ciclo > 1
+
+    for _, row in df.iterrows():
+        concurso = row['Concurso']
+        sorteadas = {row[c] for c in MEGA_SENA.cols_bolas}
+        sorteadas = {x for x in sorteadas if x == x and 1 <= x <= 60}
+
+        linha += [concurso - inicio_ciclo + 1] * len(sorteadas - dezenas_no_ciclo)
+        dezenas_no_ciclo |= sorteadas
+
+        if len(dezenas_no_ciclo) == 60:
+            curvas.append(linha)
+            linha = []
+            dezenas_no_ciclo = set()
+            inicio_ciclo = concurso + 1
+
+    ciclo_atual = len(curvas) + 1
+    if parcial:
+        curvas = curvas[1:]
+
+    sorteios = int(df['Concurso'].max()) - inicio_ciclo + 1
+    media = np.mean(curvas, axis=0) if curvas else None
+    posicao = {
+        'Ciclo_Atual': ciclo_atual,
+        'Inicio': inicio_ciclo,
+        'Sorteios': sorteios,
+        'Cobertura': len(linha),
+        'Curva': [float(x) for x in linha],
+        'Cobertura_Esperada': int((media <= sorteios).sum()) if curvas else None,
+        'Sorteios_Esperados': (float(media[len(linha) - 1]) if linha else 0.0) if curvas else None,
+    }
+    return [[float(x) for x in c] for c in curvas], posicao
+
+
+# ------------------------------------------------------------
+# Históricos aleatórios
+# ------------------------------------------------------------
+def gerar_historico(rng, dentro_da_faixa=True):
+    """
+    Base aleatória no formato do CSV da Mega-Sena (Concurso, Data, Bola1..Bola6),
+    já convertida como nos apps. Com dentro_da_faixa=True as bolas ficam em 1..60
+    (o app de ciclos não filtra valores fora da faixa).
+    """
+    n = int(rng.integers(1, 400))
+
+    bolas = np.sort(rng.random((n, 60)).argsort(axis=1)[:, :6] + 1, axis=1).astype(float)
+
+    # Bolas ausentes e, opcionalmente, valores fora de 1..60
+    bolas[rng.random(bolas.shape) < rng.choice([0, 0.01, 0.05])] = np.nan
+    if not dentro_da_faixa:
+        fora = rng.random(bolas.shape) < rng.choice([0, 0.02])
+        bolas[fora] = rng.choice([0, 61, 75, -3], size=fora.sum())
+
+    # Gaps de concurso (saltos de 1 a 5)
+    saltos = np.where(rng.random(n) < rng.choice([0, 0.1, 0.3]), rng.integers(2, 6, n), 1)
+    concursos = np.cumsum(saltos)
+
+    df = pd.DataFrame(bolas, columns=MEGA_SENA.cols_bolas)
+    df.insert(0, "Concurso", concursos)
+    df.insert(1, "Data", "01/01/2000")
+
+    # Linhas duplicadas (mesmo concurso e mesmas bolas)
+    if n > 1 and rng.random() < 0.3:
+        repetidas = rng.choice(n, size=int(rng.integers(1, max(2, n // 20))), replace=True)
+        df = pd.concat([df, df.iloc[repetidas]]).sort_values("Concurso", kind="stable").reset_index(drop=True)
+
+    # Base que não começa no início da loteria (recorte a partir de um concurso qualquer)
+    if rng.random() < 0.3:
+        df["Concurso"] += int(rng.integers(1, 3000))
+
+    return df
+
+
+# ------------------------------------------------------------
+# Comparação campo a campo
+# ------------------------------------------------------------
+def _iguais(a, b):
+    vazio_a = a is None or (isinstance(a, float) and math.isnan(a))
+    vazio_b = b is None or (isinstance(b, float) and math.isnan(b))
+    if vazio_a or vazio_b:
+        return vazio_a and vazio_b
+    return a == b
+
+
+def comparar_tabelas(esperado, obtido):
+    """
+    Lista de diferenças (linha, coluna, esperado, obtido), respeitando a ordem das linhas.
+    """
+    if list(esperado.columns) != list(obtido.columns):
+        return [("colunas", None, list(esperado.columns), list(obtido.columns))]
+    if len(esperado) != len(obtido):
+        return [("linhas", None, len(esperado), len(obtido))]
+
+    diferencas = []
+    for i, (linha_e, linha_o) in enumerate(zip(esperado.to_dict("records"), obtido.to_dict("records"))):
+        for coluna in esperado.columns:
+            if not _iguais(linha_e[coluna], linha_o[coluna]):
+                diferencas.append((i, coluna, linha_e[coluna], linha_o[coluna]))
+    return diferencas
+
+
+def verificar_atrasos(df, rng):
+    cols_bolas = detectar_cols_bolas(df)
+    concursos = df["Concurso"].to_numpy()
+    ini, fim = sorted(rng.choice(concursos, size=2))
+
+    # Referência: exatamente como o app original filtrava e ordenava o bloco
+    df_filtrado = df[(df["Concurso"] >= ini) & (df["Concurso"] <= fim)].sort_values("Concurso")
+    esperado = referencia_atrasos(df_filtrado, cols_bolas).reset_index(drop=True)
+
+    # Motor: matriz da base inteira recortada no bloco, nas duas versões (densa
+    # int64 e compacta uint16, a usada pelos apps, pela API e pela base binária)
+    posicoes = posicoes_concursos(concursos)
+    matrizes = {
+        "densa": matriz_atrasos(matriz_ocorrencias(df, cols_bolas), posicoes),
+        "compacta": matriz_atrasos_compacta(df, cols_bolas, posicoes=posicoes),
+    }
+    idx_ini = int(concursos.searchsorted(ini, side="left"))
+    idx_fim = int(concursos.searchsorted(fim, side="right"))
+
+    diferencas = []
+    for nome, atrasos_base in matrizes.items():
+        atrasos = atrasos_bloco(atrasos_base, posicoes, idx_ini, idx_fim)
+        obtido = tabela_atrasos(atrasos, periodos_lideranca(atrasos, concursos[idx_ini:idx_fim])).reset_index(drop=True)
+        diferencas += [(f"{nome}/{d[0]}",) + d[1:] for d in comparar_tabelas(esperado, obtido)]
+    return diferencas, set()
+
+
+def verificar_frequencia(df, rng):
+    cols_bolas = detectar_cols_bolas(df)
+    concursos = df["Concurso"].to_numpy()
+    ini, fim = sorted(rng.choice(concursos, size=2))
+
+    df_filtrado = df[(df["Concurso"] >= ini) & (df["Concurso"] <= fim)]
+    esperado = referencia_frequencia(df_filtrado, cols_bolas)
+
+    diferencas = comparar_tabelas(esperado, calcular_frequencia(df_filtrado, cols_bolas))
+
+    acumuladas = contagens_acumuladas(df, cols_bolas)
+    idx_ini = int(concursos.searchsorted(ini, side="left"))
+    idx_fim = int(concursos.searchsorted(fim, side="right"))
+    diferencas += [("acumuladas",) + d[1:] for d in comparar_tabelas(esperado, frequencia_bloco(acumuladas, idx_ini, idx_fim))]
+    return diferencas, set()
+
+
+def _comparar_ciclos(esperado, obtido):
+    (df_esperado, info_esperada), (df_obtido, info_obtida) = esperado, obtido
+    diferencas = [] if df_esperado.empty and df_obtido.empty else comparar_tabelas(df_esperado, df_obtido)
+    for chave in info_esperada:
+        if not _iguais(info_esperada[chave], info_obtida[chave]):
+            diferencas.append(("ciclo_atual", chave, info_esperada[chave], info_obtida[chave]))
+    return diferencas
+
+
+def verificar_ciclos(df, rng):
+    obtido = calcular_ciclos(df)
+    esperadas = set()
+
+    # Referência original, sem filtro. Se divergir, a diferença só é aceita quando
+    # desligar as regras de DIFERENCAS_ESPERADAS na referência a elimina por completo
+    diferencas = _comparar_ciclos(referencia_ciclos(df), obtido)
+    todas = dict.fromkeys(OPCOES_DIFERENCAS.values(), True)
+    so_validas = referencia_ciclos(df, **todas)
+    if diferencas:
+        diferencas = _comparar_ciclos(so_validas, obtido)
+        if not diferencas:
+            # Regra que ainda diverge quando só ela fica ligada na referência
+            for regra, opcao in OPCOES_DIFERENCAS.items():
+                if _comparar_ciclos(referencia_ciclos(df, **{**todas, opcao: False}), obtido):
+                    esperadas.add(regra)
+            # Várias juntas (nenhuma sozinha explica)
+            esperadas = esperadas or set(DIFERENCAS_ESPERADAS)
+
+    # A curva de cobertura fecha os mesmos ciclos, com a mesma duração (menos o
+    # primeiro, parcial, quando a base não começa no concurso 1)
+    df_curvas, _, _ = calcular_curvas_cobertura(df)
+    duracoes = so_validas[0]["Qtd_Sorteios"].tolist() if not so_validas[0].empty else []
+    if df["Concurso"].iloc[0] > 1:
+        duracoes = duracoes[1:]
+    if df_curvas[60].tolist() != duracoes:
+        diferencas.append(("curvas", 60, duracoes, df_curvas[60].tolist()))
+    return diferencas, esperadas
+
+
+def verificar_ciclos_gravados(df, rng):
+    concursos = df["Concurso"].to_numpy()
+    dezenas = matriz_dezenas(df, MEGA_SENA.cols_bolas)
+    fechamentos, curvas = historico_ciclos(dezenas, concursos)
+
+    # Consulta "até o concurso X" (API): prefixo qualquer da base, contra as
+    # referências com conjuntos (só dezenas válidas, como as máscaras de bits)
+    fim = int(rng.integers(1, len(df) + 1))
+    prefixo = df.iloc[:fim]
+    esperado = referencia_ciclos(prefixo, ignorar_nan=True, ignorar_fora_da_faixa=True, inicio_na_base=True)
+    diferencas = _comparar_ciclos(esperado, ciclos_ate(dezenas, concursos, fechamentos, fim))
+
+    curvas_esperadas, posicao_esperada = referencia_curvas(prefixo)
+    curvas_obtidas, _, posicao_obtida = curvas_ate(dezenas, concursos, fechamentos, curvas, fim)
+    if curvas_obtidas.to_numpy().tolist() != curvas_esperadas:
+        diferencas.append(("curvas", None, len(curvas_esperadas), len(curvas_obtidas)))
+    for chave, esperado in posicao_esperada.items():
+        obtido = posicao_obtida[chave]
+        if chave == "Curva":
+            obtido = obtido.dropna().tolist()
+        if not _iguais(esperado, obtido):
+            diferencas.append(("posicao_atual", chave, esperado, obtido))
+    return diferencas, set()
+
+
+VERIFICACOES = {
+    "atrasos": (verificar_atrasos, False),
+    "frequencia": (verificar_frequencia, False),
+    "ciclos": (verificar_ciclos, False),
+    "ciclos_gravados": (verificar_ciclos_gravados, False),
+}
+
+
+def verificar_caso(nome, semente):
+    """
+    Roda uma verificação num histórico aleatório. Retorna (df, diferenças, nomes das
+    diferenças esperadas encontradas).
+    """
+    verificar, dentro_da_faixa = VERIFICACOES[nome]
+    rng = np.random.default_rng(semente)
+    df = gerar_historico(rng, dentro_da_faixa)
+    diferencas, esperadas = verificar(df, rng)
+    return df, diferencas, esperadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os motores vetorizados com a lógica original.")
+    parser.add_argument("--casos", type=int, default=200, help="Históricos aleatórios por verificação")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--verificacoes", nargs="+", choices=list(VERIFICACOES), default=list(VERIFICACOES))
+    args = parser.parse_args()
+
+    falhas = 0
+    for nome in args.verificacoes:
+        contagem_esperadas = dict.fromkeys(DIFERENCAS_ESPERADAS, 0)
+        for caso in range(args.casos):
+            semente = args.semente + caso
+            df, diferencas, esperadas = verificar_caso(nome, semente)
+
+            for esperada in esperadas:
+                contagem_esperadas[esperada] += 1
+            if diferencas:
+                falhas += 1
+                print(f"❌ {nome}: semente {semente} ({len(df)} linhas) — {len(diferencas)} diferença(s)")
+                for d in diferencas[:5]:
+                    print(f"    linha/campo {d[0]}/{d[1]}: esperado {d[2]!r}, obtido {d[3]!r}")
+
+        print(f"{nome}: {args.casos} casos verificados")
+        for esperada, casos in contagem_esperadas.items():
+            if casos:
+                print(f"    diferença esperada `{esperada}` em {casos} caso(s): {DIFERENCAS_ESPERADAS[esperada]}")
+
+    if falhas:
+        print(f"\n{falhas} caso(s) com diferença.")
+        sys.exit(1)
+    print("\nTodos os resultados são idênticos à lógica original, exceto as diferenças esperadas listadas.")
+
+
+if __name__ == "__main__":
+    main()